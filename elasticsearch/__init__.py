@@ -19,7 +19,9 @@
 
 import logging
 import re
+import sys
 import warnings
+from typing import TYPE_CHECKING, Any
 
 from ._utils import fixup_module_metadata
 from ._version import __versionstr__
@@ -31,7 +33,6 @@ VERSION = __version__ = (_major, _minor, _patch)
 logger = logging.getLogger("elasticsearch")
 logger.addHandler(logging.NullHandler())
 
-from ._async.client import AsyncElasticsearch as AsyncElasticsearch
 from ._sync.client import Elasticsearch as Elasticsearch
 from .exceptions import ElasticsearchDeprecationWarning  # noqa: F401
 from .exceptions import (
@@ -76,5 +77,23 @@ __all__ = [
     "ElasticsearchWarning",
 ]
 
+# The async client is imported on first access, most applications
+# only use one of the clients. Python 3.6 doesn't support module
+# level __getattr__() so it's imported up front there.
+if TYPE_CHECKING or sys.version_info < (3, 7):
+    from ._async.client import AsyncElasticsearch as AsyncElasticsearch
+
+
+def __getattr__(name: str) -> Any:
+    if name == "AsyncElasticsearch":
+        from ._async.client import AsyncElasticsearch
+        from ._utils import fixup_module_metadata
+
+        globals()[name] = AsyncElasticsearch
+        fixup_module_metadata(__name__, globals())
+        return AsyncElasticsearch
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 fixup_module_metadata(__name__, globals())
 del fixup_module_metadata
@@ -17,11 +17,13 @@
 
 import re
 import warnings
+from importlib import import_module
 from typing import (
     Any,
     Callable,
     Collection,
     Dict,
+    FrozenSet,
     Iterable,
     List,
     Mapping,
@@ -29,6 +31,7 @@ from typing import (
     Tuple,
     TypeVar,
     Union,
+    cast,
 )
 
 from elastic_transport import (
@@ -61,6 +64,21 @@ SelfNamespacedType = TypeVar("SelfNamespacedType", bound="NamespacedClient")
 
 _WARNING_RE = re.compile(r"\"([^\"]*)\"")
 
+# Upper bound of merged per-request headers cached on a client
+_MAX_MERGED_HEADERS = 32
+
+# Per-request options which clients derived by options() don't inherit
+_CLIENT_OPTIONS = frozenset(
+    (
+        "_client_meta",
+        "_request_timeout",
+        "_ignore_status",
+        "_max_retries",
+        "_retry_on_timeout",
+        "_retry_on_status",
+    )
+)
+
 
 def resolve_auth_headers(
     headers: Optional[Mapping[str, str]],
@@ -231,15 +249,19 @@ default_sniff_callback = create_sniff_callback(
 
 
 class BaseClient:
+    # Per-request options are only set on the instance when they're
+    # changed so clients derived by options() don't need to copy them.
+    _client_meta: Union[DefaultType, Tuple[Tuple[str, str], ...]] = DEFAULT
+    _request_timeout: Union[DefaultType, Optional[float]] = DEFAULT
+    _ignore_status: Union[DefaultType, Collection[int]] = DEFAULT
+    _max_retries: Union[DefaultType, int] = DEFAULT
+    _retry_on_timeout: Union[DefaultType, bool] = DEFAULT
+    _retry_on_status: Union[DefaultType, Collection[int]] = DEFAULT
+
     def __init__(self, _transport: AsyncTransport) -> None:
         self._transport = _transport
-        self._client_meta: Union[DefaultType, Tuple[Tuple[str, str], ...]] = DEFAULT
         self._headers = HttpHeaders({"content-type": "application/json"})
-        self._request_timeout: Union[DefaultType, Optional[float]] = DEFAULT
-        self._ignore_status: Union[DefaultType, Collection[int]] = DEFAULT
-        self._max_retries: Union[DefaultType, int] = DEFAULT
-        self._retry_on_timeout: Union[DefaultType, bool] = DEFAULT
-        self._retry_on_status: Union[DefaultType, Collection[int]] = DEFAULT
+        self._merged_headers: Dict[FrozenSet[Tuple[str, str]], HttpHeaders] = {}
 
     @property
     def transport(self) -> AsyncTransport:
@@ -261,8 +283,7 @@ class BaseClient:
             target = f"{target}?{urlencode(params)}"
 
         if headers:
-            request_headers = self._headers.copy()
-            request_headers.update(headers)
+            request_headers = self._merge_headers(headers)
         else:
             request_headers = self._headers
 
@@ -348,6 +369,25 @@ class BaseClient:
 
         return response
 
+    def _merge_headers(self, headers: Mapping[str, str]) -> HttpHeaders:
+        # Per-request headers come in a few combinations, like the
+        # 'content-type' of bulk requests. Their merge with the client's
+        # headers is frozen and cached so requests can share it.
+        key: Optional[FrozenSet[Tuple[str, str]]]
+        try:
+            key = frozenset(headers.items())
+            return self._merged_headers[key]
+        except KeyError:
+            pass
+        except TypeError:  # Unhashable header values aren't cached
+            key = None
+
+        request_headers = self._headers.copy()
+        request_headers.update(headers)
+        if key is not None and len(self._merged_headers) < _MAX_MERGED_HEADERS:
+            self._merged_headers[key] = request_headers.freeze()
+        return request_headers
+
     def options(
         self: SelfType,
         *,
@@ -362,7 +402,18 @@ class BaseClient:
         retry_on_status: Union[DefaultType, int, Collection[int]] = DEFAULT,
         retry_on_timeout: Union[DefaultType, bool] = DEFAULT,
     ) -> SelfType:
-        client = type(self)(_transport=self.transport)
+        # The new client skips __init__(), instead it gets the attributes
+        # of this client like the transport, headers and anything set by
+        # the __init__() of a subclass. Namespaced clients are bound to
+        # this client so they're created again once they're first accessed.
+        client = cast(SelfType, object.__new__(cast(Any, type(self))))
+        client_class = type(self)
+        client.__dict__.update(
+            (name, value)
+            for name, value in self.__dict__.items()
+            if name not in _CLIENT_OPTIONS
+            and not isinstance(getattr(client_class, name, None), _LazyNamespacedClient)
+        )
 
         resolved_headers = resolve_default(headers, None)
         resolved_headers = resolve_auth_headers(
@@ -379,8 +430,11 @@ class BaseClient:
             new_headers = self._headers.copy()
             new_headers.update(resolved_headers)
             client._headers = new_headers
+            client._merged_headers = {}
         else:
-            client._headers = self._headers.copy()
+            # Headers of a client are never changed once it was created.
+            client._headers = self._headers
+            client._merged_headers = self._merged_headers
 
         if request_timeout is not DEFAULT:
             client._request_timeout = request_timeout
@@ -408,6 +462,40 @@ class BaseClient:
         return client
 
 
+class _LazyNamespacedClient:
+    """
+    Creates a namespaced client the first time it's accessed on a
+    client and caches it on that client instance. The module defining
+    the namespaced client is only imported then, relative to the package
+    of the client class.
+    """
+
+    def __init__(self, module: str, class_name: str) -> None:
+        self.module = module
+        self.class_name = class_name
+        self.name = ""
+        self.package = ""
+        self._namespaced_client_class: Any = None
+
+    def __set_name__(self, owner: Any, name: str) -> None:
+        self.name = name
+        self.package = owner.__module__
+
+    @property
+    def namespaced_client_class(self) -> Any:
+        if self._namespaced_client_class is None:
+            module = import_module(f"{self.package}.{self.module}")
+            self._namespaced_client_class = getattr(module, self.class_name)
+        return self._namespaced_client_class
+
+    def __get__(self, client: Any, owner: Any = None) -> Any:
+        if client is None:
+            return self
+        namespaced_client = self.namespaced_client_class(client)
+        client.__dict__[self.name] = namespaced_client
+        return namespaced_client
+
+
 class NamespacedClient(BaseClient):
     def __init__(self, client: "BaseClient") -> None:
         self._client = client
@@ -17,29 +17,46 @@
 
 import asyncio
 import logging
+import time
 
+from ..compat import to_bytes
 from ..exceptions import NotFoundError, TransportError
 from ..helpers.actions import (
     _ActionChunker,
+    _AdaptiveChunkSize,
+    _BulkSpool,
+    _failed_actions,
+    _get_chunk_sizer,
+    _is_rejected,
+    _parse_bulk_body,
     _process_bulk_chunk_error,
     _process_bulk_chunk_success,
+    _retry_backoff,
+    _split_bulk_body,
     expand_action,
 )
 from ..helpers.errors import ScanError
 from .client import AsyncElasticsearch  # noqa
+from .compat import get_running_loop
 
 logger = logging.getLogger("elasticsearch.helpers")
 
 
 async def _chunk_actions(actions, chunk_size, max_chunk_bytes, serializer):
     """
-    Split actions into chunks by number or size, serialize them into strings in
-    the process.
+    Split actions into chunks by number or size, serialize them into
+    newline-delimited bytes in the process. ``chunk_size`` can also be an
+    :class:`_AdaptiveChunkSize` which is followed for every new action.
     """
+    chunk_sizer = None
+    if isinstance(chunk_size, _AdaptiveChunkSize):
+        chunk_sizer, chunk_size = chunk_size, chunk_size.chunk_size
     chunker = _ActionChunker(
         chunk_size=chunk_size, max_chunk_bytes=max_chunk_bytes, serializer=serializer
     )
     async for action, data in actions:
+        if chunk_sizer is not None:
+            chunker.chunk_size = chunk_sizer.chunk_size
         ret = chunker.feed(action, data)
         if ret:
             yield ret
@@ -48,6 +65,35 @@ async def _chunk_actions(actions, chunk_size, max_chunk_bytes, serializer):
         yield ret
 
 
+async def _spool_chunks(spool, chunks, serializer):
+    """
+    Yield the chunks left behind in ``spool`` by a previous call and then
+    ``chunks``, each of them written to a segment first, along with their
+    segment. The files are read, written and synced in the default executor
+    so that the event loop isn't blocked.
+    """
+    loop = get_running_loop()
+
+    def spool_chunk(bulk_actions):
+        spool.write(bulk_actions)
+        return spool.seal()
+
+    replay = spool.replay()
+    while True:
+        replayed = await loop.run_in_executor(None, next, replay, None)
+        if replayed is None:
+            break
+        segment, bulk_actions = replayed
+        bulk_data, bulk_actions = _parse_bulk_body(bulk_actions, serializer)
+        if bulk_data:
+            yield bulk_data, bulk_actions, segment
+        else:
+            await loop.run_in_executor(None, spool.remove, segment)
+    async for bulk_data, bulk_actions in chunks:
+        segment = await loop.run_in_executor(None, spool_chunk, bulk_actions)
+        yield bulk_data, bulk_actions, segment
+
+
 async def _process_bulk_chunk(
     client,
     bulk_actions,
@@ -86,6 +132,28 @@ async def _process_bulk_chunk(
         yield item
 
 
+async def _measure_bulk_chunk(chunk_sizer, bulk_data, results):
+    """
+    Async version of :meth:`_AdaptiveChunkSize.measure`, consume the results
+    of :func:`_process_bulk_chunk` and record how long the request took and
+    whether any documents were rejected.
+    """
+    start = time.monotonic()
+    try:
+        results = [item async for item in results]
+    except TransportError as e:
+        chunk_sizer.record(
+            len(bulk_data), time.monotonic() - start, e.status_code == 429
+        )
+        raise
+    chunk_sizer.record(
+        len(bulk_data),
+        time.monotonic() - start,
+        any(not ok and _is_rejected(info) for ok, info in results),
+    )
+    return results
+
+
 def aiter(x):
     """Turns an async iterable or iterable into an async iterator"""
     if hasattr(x, "__anext__"):
@@ -112,6 +180,79 @@ async def azip(*iterables):
         pass
 
 
+async def _process_chunk_with_retries(
+    client,
+    bulk_data,
+    bulk_actions,
+    chunk_sizer=None,
+    raise_on_error=True,
+    raise_on_exception=True,
+    max_retries=0,
+    initial_backoff=2,
+    max_backoff=600,
+    yield_ok=True,
+    ignore_status=(),
+    *args,
+    **kwargs,
+):
+    """
+    Send a serialized chunk and yield the results per action, documents
+    rejected with a ``429`` status code are sent again up to ``max_retries``
+    times reusing their serialized lines.
+    """
+    for attempt in range(max_retries + 1):
+        to_retry, to_retry_data, lines = [], [], None
+        if attempt:
+            await asyncio.sleep(_retry_backoff(attempt, initial_backoff, max_backoff))
+
+        try:
+            results = _process_bulk_chunk(
+                client,
+                bulk_actions,
+                bulk_data,
+                raise_on_exception,
+                raise_on_error,
+                ignore_status,
+                *args,
+                **kwargs,
+            )
+            if chunk_sizer is not None:
+                results = await _measure_bulk_chunk(chunk_sizer, bulk_data, results)
+
+            async for i, data, (ok, info) in azip(
+                range(len(bulk_data)), bulk_data, results
+            ):
+
+                if not ok:
+                    action, info = info.popitem()
+                    # retry if retries enabled, we get 429, and we are not
+                    # in the last attempt
+                    if (
+                        max_retries
+                        and info["status"] == 429
+                        and (attempt + 1) <= max_retries
+                    ):
+                        # reuse the already serialized lines of the document
+                        if lines is None:
+                            lines = _split_bulk_body(bulk_actions, bulk_data)
+                        to_retry.append(lines[i])
+                        to_retry_data.append(data)
+                    else:
+                        yield ok, {action: info}
+                elif yield_ok:
+                    yield ok, info
+
+        except TransportError as e:
+            # suppress 429 errors since we will retry them
+            if attempt == max_retries or e.status_code != 429:
+                raise
+        else:
+            if not to_retry:
+                break
+            # retry only subset of documents that didn't succeed
+            bulk_actions, bulk_data = b"".join(to_retry), to_retry_data
+
+
 async def async_streaming_bulk(
     client,
     actions,
@@ -126,6 +267,12 @@ async def async_streaming_bulk(
     yield_ok=True,
     ignore_status=(),
     *args,
+    max_concurrency=1,
+    ordered=True,
+    min_chunk_size=10,
+    max_chunk_size=10000,
+    target_latency=1.0,
+    spool_dir=None,
     **kwargs,
 ):
 
@@ -137,14 +284,18 @@ async def async_streaming_bulk(
     entire input is consumed and sent.
 
     If you specify ``max_retries`` it will also retry any documents that were
-    rejected with a ``429`` status code. To do this it will wait (**by calling
-    asyncio.sleep**) for ``initial_backoff`` seconds and then,
-    every subsequent rejection for the same chunk, for double the time every
-    time up to ``max_backoff`` seconds.
+    rejected with a ``429`` status code, reusing their serialized lines. To do
+    this it will wait (**by calling asyncio.sleep**) for ``initial_backoff``
+    seconds and then, every subsequent rejection for the same chunk, for
+    double the time every time up to ``max_backoff`` seconds. The wait is
+    randomly shortened by up to half so retries are spread out. Only the task
+    sending the rejected chunk waits when ``max_concurrency`` is used.
 
     :arg client: instance of :class:`~elasticsearch.AsyncElasticsearch` to use
     :arg actions: iterable or async iterable containing the actions to be executed
-    :arg chunk_size: number of docs in one chunk sent to es (default: 500)
+    :arg chunk_size: number of docs in one chunk sent to es (default: 500), or
+        ``"auto"`` to adjust it to how long requests take (see
+        ``target_latency``)
     :arg max_chunk_bytes: the maximum size of the request in bytes (default: 100MB)
     :arg raise_on_error: raise ``BulkIndexError`` containing errors (as `.errors`)
         from the execution of the last chunk when some occur. By default we raise.
@@ -161,6 +312,33 @@ async def async_streaming_bulk(
     :arg max_backoff: maximum number of seconds a retry will wait
     :arg yield_ok: if set to False will skip successful documents in the output
     :arg ignore_status: list of HTTP status code that you want to ignore
+    :arg min_chunk_size: smallest number of docs in one chunk when
+        ``chunk_size="auto"`` (default: 10)
+    :arg max_chunk_size: largest number of docs in one chunk when
+        ``chunk_size="auto"`` (default: 10000)
+    :arg target_latency: when ``chunk_size="auto"``, chunks grow by a fixed
+        number of docs while requests take at most this many seconds (default:
+        1.0) and are halved when a request takes longer or documents are
+        rejected because elasticsearch is overloaded.
+    :arg max_concurrency: number of chunks that can be in-flight at the same
+        time, every chunk is sent and retried in its own task. Set to 1
+        (default) to send one chunk at a time.
+    :arg ordered: when ``max_concurrency`` is greater than 1, yield the results
+        in the order the chunks were sent (default: ``True``), set to
+        ``False`` to yield the results of every chunk as soon as it completes.
+        Chunks which completed count towards ``max_concurrency`` until their
+        results were yielded, so with ``True`` no new chunks are sent while
+        ``max_concurrency`` chunks wait for a slower one.
+    :arg spool_dir: directory of a write-ahead log of the chunks, see below
+
+    With a ``spool_dir`` every chunk is written to a segment file in that
+    directory before it's sent. Once every action of the chunk has a result,
+    including the rejected ones which were retried, the segment is removed.
+    Segments left behind by a process which died, or by a call which raised
+    an exception, are sent again before the new actions by the next call
+    with the same ``spool_dir``. Actions are therefore sent at least once,
+    use explicit ``_id`` values to avoid duplicate documents. A directory
+    must only be used by one call at a time.
     """
 
     client = client.options()
@@ -171,60 +349,89 @@ async def async_streaming_bulk(
             yield expand_action_callback(item)
 
     serializer = client.transport.serializers.get_serializer("application/json")
+    chunk_sizer = _get_chunk_sizer(
+        chunk_size, min_chunk_size, max_chunk_size, target_latency
+    )
 
-    async for bulk_data, bulk_actions in _chunk_actions(
-        map_actions(), chunk_size, max_chunk_bytes, serializer
-    ):
+    async def process_chunk(bulk_data, bulk_actions, segment=None):
+        async for item in _process_chunk_with_retries(
+            client,
+            bulk_data,
+            bulk_actions,
+            chunk_sizer,
+            raise_on_error,
+            raise_on_exception,
+            max_retries,
+            initial_backoff,
+            max_backoff,
+            yield_ok,
+            ignore_status,
+            *args,
+            **kwargs,
+        ):
+            yield item
+        # every action of the chunk has a result, including the retried ones
+        if segment is not None:
+            await get_running_loop().run_in_executor(None, spool.remove, segment)
 
-        for attempt in range(max_retries + 1):
-            to_retry, to_retry_data = [], []
-            if attempt:
-                await asyncio.sleep(
-                    min(max_backoff, initial_backoff * 2 ** (attempt - 1))
-                )
+    async def collect_chunk(chunk):
+        return [item async for item in process_chunk(*chunk)]
 
-            try:
-                async for data, (ok, info) in azip(
-                    bulk_data,
-                    _process_bulk_chunk(
-                        client,
-                        bulk_actions,
-                        bulk_data,
-                        raise_on_exception,
-                        raise_on_error,
-                        ignore_status,
-                        *args,
-                        **kwargs,
-                    ),
-                ):
-
-                    if not ok:
-                        action, info = info.popitem()
-                        # retry if retries enabled, we get 429, and we are not
-                        # in the last attempt
-                        if (
-                            max_retries
-                            and info["status"] == 429
-                            and (attempt + 1) <= max_retries
-                        ):
-                            # _process_bulk_chunk expects strings so we need to
-                            # re-serialize the data
-                            to_retry.extend(map(serializer.dumps, data))
-                            to_retry_data.append(data)
-                        else:
-                            yield ok, {action: info}
-                    elif yield_ok:
-                        yield ok, info
-
-            except TransportError as e:
-                # suppress 429 errors since we will retry them
-                if attempt == max_retries or e.status_code != 429:
-                    raise
+    chunks = _chunk_actions(
+        map_actions(), chunk_sizer or chunk_size, max_chunk_bytes, serializer
+    )
+    if spool_dir is not None:
+        spool = await get_running_loop().run_in_executor(None, _BulkSpool, spool_dir)
+        chunks = _spool_chunks(spool, chunks, serializer)
+
+    if max_concurrency <= 1:
+        async for chunk in chunks:
+            async for item in process_chunk(*chunk):
+                yield item
+        return
+
+    # Every chunk is sent and retried in its own task. Tasks are pending
+    # until their results were yielded, so at most max_concurrency chunks
+    # are either in-flight or holding results behind a slower chunk.
+    pending = []
+
+    async def completed_chunks(wait=False):
+        # Results are yielded either in the order the chunks were
+        # sent or as soon as any of the chunks has completed.
+        if wait:
+            await asyncio.wait(
+                pending[:1] if ordered else pending,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        while pending:
+            if ordered:
+                task = pending[0] if pending[0].done() else None
             else:
-                if not to_retry:
-                    break
-                # retry only subset of documents that didn't succeed
-                bulk_actions, bulk_data = to_retry, to_retry_data
+                task = next((task for task in pending if task.done()), None)
+            if task is None:
+                break
+            pending.remove(task)
+            for item in task.result():
+                yield item
+
+    try:
+        async for chunk in chunks:
+            while len(pending) >= max_concurrency:
+                async for item in completed_chunks(wait=True):
+                    yield item
+            pending.append(asyncio.ensure_future(collect_chunk(chunk)))
+            async for item in completed_chunks():
+                yield item
+
+        while pending:
+            async for item in completed_chunks(wait=True):
+                yield item
+
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
 
 
 async def async_bulk(
@@ -279,6 +486,235 @@ async def async_bulk(
     return success, failed if stats_only else errors
 
 
+class AsyncBulkProcessor:
+    """
+    Async version of :class:`~elasticsearch.helpers.BulkProcessor`, buffer
+    actions added one at a time by any number of tasks and send them to
+    elasticsearch in the background.
+
+    A chunk is sent as soon as it contains ``chunk_size`` actions or
+    ``max_chunk_bytes`` bytes, buffered actions are also sent every
+    ``flush_interval`` seconds. Every chunk is sent in its own task, once
+    ``concurrent_requests`` of them are in-flight :meth:`add` waits until
+    one of them completes.
+
+    Results are reported per action to ``success_callback`` and
+    ``error_callback``. Failed actions are never raised, without an
+    ``error_callback`` they're logged instead. Call :meth:`aclose` or use the
+    processor as an async context manager to send the remaining actions::
+
+        async with AsyncBulkProcessor(client) as processor:
+            async for doc in docs:
+                await processor.add({"_index": "my-index", "_source": doc})
+
+    :arg client: instance of :class:`~elasticsearch.AsyncElasticsearch` to use
+    :arg chunk_size: number of docs in one chunk sent to es (default: 500)
+    :arg max_chunk_bytes: the maximum size of the request in bytes (default: 100MB)
+    :arg flush_interval: number of seconds after which buffered actions are
+        sent even when the chunk isn't full (default: 5.0), ``None`` to only
+        send full chunks
+    :arg concurrent_requests: number of chunks that can be in-flight at the
+        same time (default: 1)
+    :arg expand_action_callback: callback executed on each action passed in,
+        should return a tuple containing the action line and the data line
+        (`None` if data line should be omitted).
+    :arg success_callback: called with the result of every action which
+        succeeded
+    :arg error_callback: called with the error of every action which failed,
+        including the actions of requests which raised an exception
+    :arg ignore_status: list of HTTP status code that you want to ignore
+
+    Any additional keyword arguments, like ``max_retries``, are handled the
+    same way as by :func:`~elasticsearch.helpers.async_streaming_bulk`.
+    """
+
+    def __init__(
+        self,
+        client,
+        chunk_size=500,
+        max_chunk_bytes=100 * 1024 * 1024,
+        flush_interval=5.0,
+        concurrent_requests=1,
+        expand_action_callback=expand_action,
+        success_callback=None,
+        error_callback=None,
+        ignore_status=(),
+        **kwargs,
+    ):
+        self.client = client.options()
+        self.client._client_meta = (("h", "bp"),)
+        self.chunk_size = chunk_size
+        self.max_chunk_bytes = max_chunk_bytes
+        self.flush_interval = flush_interval
+        self.concurrent_requests = concurrent_requests
+        self.expand_action_callback = expand_action_callback
+        self.success_callback = success_callback
+        self.error_callback = error_callback
+        self.ignore_status = ignore_status
+        self.kwargs = kwargs
+
+        self.serializer = self.client.transport.serializers.get_serializer(
+            "application/json"
+        )
+        self._chunker = _ActionChunker(chunk_size, max_chunk_bytes, self.serializer)
+        self._closed = False
+        # The semaphore and the tasks are created once the first action is
+        # added so the processor can be created outside of the event loop.
+        self._semaphore = None
+        self._closing = None
+        self._flusher = None
+        self._tasks = set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        await self.aclose()
+
+    async def add(self, action):
+        """
+        Add an action, waits while ``concurrent_requests`` chunks are
+        in-flight and the chunk is full.
+        """
+        if self._closed:
+            raise RuntimeError("Can't add actions to a closed AsyncBulkProcessor")
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrent_requests)
+            self._closing = asyncio.Event()
+            if self.flush_interval is not None:
+                self._flusher = asyncio.ensure_future(self._flush_periodically())
+
+        action, data = self.expand_action_callback(action)
+        encoded = to_bytes(self.serializer.dumps(action), "utf-8") + b"\n"
+        if data is not None:
+            encoded += to_bytes(self.serializer.dumps(data), "utf-8") + b"\n"
+            data = (action, data)
+        else:
+            data = (action,)
+
+        chunk = self._chunker.feed_encoded(data, encoded)
+        if chunk:
+            await self._send(chunk)
+        # don't wait for the next action to send a full chunk
+        if self._chunker.is_full():
+            await self._send(self._chunker.flush())
+
+    async def flush(self):
+        """
+        Send the buffered actions and wait until all actions added so far
+        were sent and their results were reported.
+        """
+        chunk = self._chunker.flush()
+        if chunk:
+            await self._send(chunk)
+        if self._tasks:
+            await asyncio.wait(list(self._tasks))
+
+    async def aclose(self):
+        """
+        Send the buffered actions and wait for all requests to finish.
+        Actions can't be added afterwards.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._flusher is not None:
+            # Not cancelled, a chunk it's about to send would be lost
+            self._closing.set()
+            await self._flusher
+        await self.flush()
+
+    async def _send(self, chunk):
+        await self._semaphore.acquire()
+        task = asyncio.ensure_future(self._send_chunk(*chunk))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush_periodically(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._closing.wait(), self.flush_interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            chunk = self._chunker.flush()
+            if chunk:
+                await self._send(chunk)
+
+    async def _send_chunk(self, bulk_data, bulk_actions):
+        try:
+            try:
+                results = [
+                    item
+                    async for item in _process_chunk_with_retries(
+                        self.client,
+                        bulk_data,
+                        bulk_actions,
+                        raise_on_error=False,
+                        raise_on_exception=False,
+                        yield_ok=self.success_callback is not None,
+                        ignore_status=self.ignore_status,
+                        **self.kwargs,
+                    )
+                ]
+            except Exception as e:
+                # errors which aren't API errors, like connection errors,
+                # are raised even with raise_on_exception=False.
+                results = [
+                    (False, info) for info in _failed_actions(e, bulk_data, None)
+                ]
+
+            for ok, info in results:
+                if ok:
+                    self.success_callback(info)
+                elif self.error_callback is not None:
+                    self.error_callback(info)
+                else:
+                    logger.warning("Bulk action failed: %r", info)
+        except Exception:
+            logger.exception("Failed to report the results of a bulk request")
+        finally:
+            self._semaphore.release()
+
+
+async def _prefetch(aiterator, size):
+    """
+    Consume an async generator in a background task, keeping up to ``size``
+    of its items ahead of the caller. Once the caller stops iterating the
+    generator is closed within the background task as well.
+    """
+    items = asyncio.Queue(size)
+    done = object()
+
+    async def produce():
+        try:
+            try:
+                async for item in aiterator:
+                    await items.put((item, None))
+            finally:
+                await aiterator.aclose()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await items.put((done, e))
+        else:
+            await items.put((done, None))
+
+    task = asyncio.ensure_future(produce())
+    try:
+        while True:
+            item, error = await items.get()
+            if error is not None:
+                raise error
+            if item is done:
+                break
+            yield item
+
+    finally:
+        task.cancel()
+        await asyncio.wait([task])
+
+
 async def async_scan(
     client,
     query=None,
@@ -289,6 +725,7 @@ async def async_scan(
     request_timeout=None,
     clear_scroll=True,
     scroll_kwargs=None,
+    prefetch=0,
     **kwargs,
 ):
     """
@@ -319,6 +756,9 @@ async def async_scan(
         to true.
     :arg scroll_kwargs: additional kwargs to be passed to
         :meth:`~elasticsearch.AsyncElasticsearch.scroll`
+    :arg prefetch: number of pages to fetch in a background task ahead of
+        the hits being consumed, set to 0 (default) to only request the next
+        page once all hits of the current one were consumed.
 
     Any additional keyword arguments will be passed to the initial
     :meth:`~elasticsearch.AsyncElasticsearch.search` call::
@@ -369,15 +809,34 @@ async def async_scan(
         search_kwargs["size"] = size
         resp = await client.search(body=query, **search_kwargs)
 
-    scroll_id = resp.raw.get("_scroll_id")
     scroll_transport_kwargs = pop_transport_kwargs(scroll_kwargs)
     if scroll_transport_kwargs:
         scroll_client = client.options(**scroll_transport_kwargs)
     else:
         scroll_client = client
 
+    async def scroll_pages(resp):
+        scroll_id = resp.raw.get("_scroll_id")
+        try:
+            while scroll_id and resp.raw["hits"]["hits"]:
+                yield resp
+                resp = await scroll_client.scroll(
+                    scroll_id=scroll_id, scroll=scroll, **scroll_kwargs
+                )
+                scroll_id = resp.raw.get("_scroll_id")
+
+        finally:
+            if scroll_id and clear_scroll:
+                await client.options(ignore_status=404).clear_scroll(
+                    scroll_id=scroll_id
+                )
+
+    pages = scroll_pages(resp)
+    if prefetch:
+        pages = _prefetch(pages, prefetch)
+
     try:
-        while scroll_id and resp.raw["hits"]["hits"]:
+        async for resp in pages:
             for hit in resp.raw["hits"]["hits"]:
                 yield hit
 
@@ -397,7 +856,7 @@ async def async_scan(
                 )
                 if raise_on_error:
                     raise ScanError(
-                        scroll_id,
+                        resp.raw["_scroll_id"],
                         shards_message
                         % (
                             shards_successful,
@@ -405,14 +864,9 @@ async def async_scan(
                             shards_total,
                         ),
                     )
-            resp = await scroll_client.scroll(
-                scroll_id=scroll_id, scroll=scroll, **scroll_kwargs
-            )
-            scroll_id = resp.raw.get("_scroll_id")
 
     finally:
-        if scroll_id and clear_scroll:
-            await client.options(ignore_status=404).clear_scroll(scroll_id=scroll_id)
+        await pages.aclose()
 
 
 async def async_reindex(
@@ -59,7 +59,7 @@ def azip(
 def async_streaming_bulk(
     client: AsyncElasticsearch,
     actions: Union[Iterable[Any], AsyncIterable[Any]],
-    chunk_size: int = ...,
+    chunk_size: Union[int, str] = ...,
     max_chunk_bytes: int = ...,
     raise_on_error: bool = ...,
     expand_action_callback: Callable[[Any], Tuple[Dict[str, Any], Optional[Any]]] = ...,
@@ -70,6 +70,12 @@ def async_streaming_bulk(
     yield_ok: bool = ...,
     ignore_status: Optional[Union[int, Collection[int]]] = ...,
     *args: Any,
+    max_concurrency: int = ...,
+    ordered: bool = ...,
+    min_chunk_size: int = ...,
+    max_chunk_size: int = ...,
+    target_latency: float = ...,
+    spool_dir: Optional[str] = ...,
     **kwargs: Any,
 ) -> AsyncGenerator[Tuple[bool, Any], None]: ...
 async def async_bulk(
@@ -80,6 +86,40 @@ async def async_bulk(
     *args: Any,
     **kwargs: Any,
 ) -> Tuple[int, Union[int, List[Any]]]: ...
+
+class AsyncBulkProcessor:
+    client: AsyncElasticsearch
+    chunk_size: int
+    max_chunk_bytes: int
+    flush_interval: Optional[float]
+    concurrent_requests: int
+    expand_action_callback: Callable[[Any], Tuple[Dict[str, Any], Optional[Any]]]
+    success_callback: Optional[Callable[[Any], None]]
+    error_callback: Optional[Callable[[Any], None]]
+    ignore_status: Optional[Union[int, Collection[int]]]
+    kwargs: Dict[str, Any]
+    serializer: Serializer
+    def __init__(
+        self,
+        client: AsyncElasticsearch,
+        chunk_size: int = ...,
+        max_chunk_bytes: int = ...,
+        flush_interval: Optional[float] = ...,
+        concurrent_requests: int = ...,
+        expand_action_callback: Callable[
+            [Any], Tuple[Dict[str, Any], Optional[Any]]
+        ] = ...,
+        success_callback: Optional[Callable[[Any], None]] = ...,
+        error_callback: Optional[Callable[[Any], None]] = ...,
+        ignore_status: Optional[Union[int, Collection[int]]] = ...,
+        **kwargs: Any,
+    ) -> None: ...
+    async def __aenter__(self) -> "AsyncBulkProcessor": ...
+    async def __aexit__(self, *_: Any) -> None: ...
+    async def add(self, action: Any) -> None: ...
+    async def flush(self) -> None: ...
+    async def aclose(self) -> None: ...
+
 def async_scan(
     client: AsyncElasticsearch,
     query: Optional[Any] = ...,
@@ -90,6 +130,7 @@ def async_scan(
     request_timeout: Optional[Union[float, int]] = ...,
     clear_scroll: bool = ...,
     scroll_kwargs: Optional[Mapping[str, Any]] = ...,
+    prefetch: int = ...,
     **kwargs: Any,
 ) -> AsyncGenerator[int, None]: ...
 async def async_reindex(
@@ -26,41 +26,11 @@ from elastic_transport.client_utils import DEFAULT
 from ...serializer import DEFAULT_SERIALIZERS
 from ._base import (
     BaseClient,
+    _LazyNamespacedClient,
     create_sniff_callback,
     default_sniff_callback,
     resolve_auth_headers,
 )
-from .async_search import AsyncSearchClient
-from .autoscaling import AutoscalingClient
-from .cat import CatClient
-from .ccr import CcrClient
-from .cluster import ClusterClient
-from .dangling_indices import DanglingIndicesClient
-from .enrich import EnrichClient
-from .eql import EqlClient
-from .features import FeaturesClient
-from .fleet import FleetClient
-from .graph import GraphClient
-from .ilm import IlmClient
-from .indices import IndicesClient
-from .ingest import IngestClient
-from .license import LicenseClient
-from .logstash import LogstashClient
-from .migration import MigrationClient
-from .ml import MlClient
-from .monitoring import MonitoringClient
-from .nodes import NodesClient
-from .rollup import RollupClient
-from .searchable_snapshots import SearchableSnapshotsClient
-from .security import SecurityClient
-from .shutdown import ShutdownClient
-from .slm import SlmClient
-from .snapshot import SnapshotClient
-from .sql import SqlClient
-from .ssl import SslClient
-from .tasks import TasksClient
-from .text_structure import TextStructureClient
-from .transform import TransformClient
 from .utils import (
     _TYPE_HOSTS,
     CLIENT_META_SERVICE,
@@ -70,8 +40,6 @@ from .utils import (
     client_node_configs,
     query_params,
 )
-from .watcher import WatcherClient
-from .xpack import XPackClient
 
 logger = logging.getLogger("elasticsearch")
 
@@ -110,6 +78,47 @@ class Elasticsearch(BaseClient):
         client.options(api_key=("id", "api_key")).search(...)
     """
 
+    # namespaced clients for compatibility with API names,
+    # created once they're first accessed on a client
+    async_search = _LazyNamespacedClient("async_search", "AsyncSearchClient")
+    autoscaling = _LazyNamespacedClient("autoscaling", "AutoscalingClient")
+    cat = _LazyNamespacedClient("cat", "CatClient")
+    cluster = _LazyNamespacedClient("cluster", "ClusterClient")
+    features = _LazyNamespacedClient("features", "FeaturesClient")
+    indices = _LazyNamespacedClient("indices", "IndicesClient")
+    ingest = _LazyNamespacedClient("ingest", "IngestClient")
+    nodes = _LazyNamespacedClient("nodes", "NodesClient")
+    snapshot = _LazyNamespacedClient("snapshot", "SnapshotClient")
+    tasks = _LazyNamespacedClient("tasks", "TasksClient")
+
+    xpack = _LazyNamespacedClient("xpack", "XPackClient")
+    ccr = _LazyNamespacedClient("ccr", "CcrClient")
+    dangling_indices = _LazyNamespacedClient(
+        "dangling_indices", "DanglingIndicesClient"
+    )
+    enrich = _LazyNamespacedClient("enrich", "EnrichClient")
+    eql = _LazyNamespacedClient("eql", "EqlClient")
+    fleet = _LazyNamespacedClient("fleet", "FleetClient")
+    graph = _LazyNamespacedClient("graph", "GraphClient")
+    ilm = _LazyNamespacedClient("ilm", "IlmClient")
+    license = _LazyNamespacedClient("license", "LicenseClient")
+    logstash = _LazyNamespacedClient("logstash", "LogstashClient")
+    migration = _LazyNamespacedClient("migration", "MigrationClient")
+    ml = _LazyNamespacedClient("ml", "MlClient")
+    monitoring = _LazyNamespacedClient("monitoring", "MonitoringClient")
+    rollup = _LazyNamespacedClient("rollup", "RollupClient")
+    searchable_snapshots = _LazyNamespacedClient(
+        "searchable_snapshots", "SearchableSnapshotsClient"
+    )
+    security = _LazyNamespacedClient("security", "SecurityClient")
+    slm = _LazyNamespacedClient("slm", "SlmClient")
+    shutdown = _LazyNamespacedClient("shutdown", "ShutdownClient")
+    sql = _LazyNamespacedClient("sql", "SqlClient")
+    ssl = _LazyNamespacedClient("ssl", "SslClient")
+    text_structure = _LazyNamespacedClient("text_structure", "TextStructureClient")
+    transform = _LazyNamespacedClient("transform", "TransformClient")
+    watcher = _LazyNamespacedClient("watcher", "WatcherClient")
+
     def __init__(
         self,
         hosts: Optional[_TYPE_HOSTS] = None,
@@ -366,42 +375,6 @@ class Elasticsearch(BaseClient):
             bearer_auth=bearer_auth,
         )
 
-        # namespaced clients for compatibility with API names
-        self.async_search = AsyncSearchClient(self)
-        self.autoscaling = AutoscalingClient(self)
-        self.cat = CatClient(self)
-        self.cluster = ClusterClient(self)
-        self.features = FeaturesClient(self)
-        self.indices = IndicesClient(self)
-        self.ingest = IngestClient(self)
-        self.nodes = NodesClient(self)
-        self.snapshot = SnapshotClient(self)
-        self.tasks = TasksClient(self)
-
-        self.xpack = XPackClient(self)
-        self.ccr = CcrClient(self)
-        self.dangling_indices = DanglingIndicesClient(self)
-        self.enrich = EnrichClient(self)
-        self.eql = EqlClient(self)
-        self.fleet = FleetClient(self)
-        self.graph = GraphClient(self)
-        self.ilm = IlmClient(self)
-        self.license = LicenseClient(self)
-        self.logstash = LogstashClient(self)
-        self.migration = MigrationClient(self)
-        self.ml = MlClient(self)
-        self.monitoring = MonitoringClient(self)
-        self.rollup = RollupClient(self)
-        self.searchable_snapshots = SearchableSnapshotsClient(self)
-        self.security = SecurityClient(self)
-        self.slm = SlmClient(self)
-        self.shutdown = ShutdownClient(self)
-        self.sql = SqlClient(self)
-        self.ssl = SslClient(self)
-        self.text_structure = TextStructureClient(self)
-        self.transform = TransformClient(self)
-        self.watcher = WatcherClient(self)
-
     def __repr__(self):
         try:
             # get a list of all connections
@@ -19,13 +19,14 @@
 import base64
 import warnings
 from datetime import date, datetime
-from functools import wraps
+from functools import lru_cache, wraps
 from typing import (
     TYPE_CHECKING,
     Any,
     Awaitable,
     Callable,
     Collection,
+    Dict,
     List,
     Mapping,
     MutableMapping,
@@ -191,8 +192,12 @@ def _escape(value: Any) -> Union[bytes, str]:
     or tuple, turn it into a comma-separated string first.
     """
 
+    # strings are the most common values
+    if isinstance(value, str):
+        return value.encode("utf-8")
+
     # make sequences into comma-separated stings
-    if isinstance(value, (list, tuple)):
+    elif isinstance(value, (list, tuple)):
         value = ",".join(value)
 
     # dates and datetimes into isoformat
@@ -212,6 +217,17 @@ def _escape(value: Any) -> Union[bytes, str]:
     return value.encode("utf-8")
 
 
+def _quote_path_part(part: Any) -> str:
+    # preserve ',' and '*' in url for nicer URLs in logs
+    return quote(_escape(part), b",*")
+
+
+# Index and endpoint names repeat on almost every request so quoted
+# string parts are cached. Frequently used names stay in the LRU cache
+# while one-off ids are evicted.
+_quote_str_path_part = lru_cache(maxsize=1024)(_quote_path_part)
+
+
 def _make_path(*parts: Any) -> str:
     """
     Create a URL string from parts, omit all `None` values and empty strings.
@@ -219,8 +235,7 @@ def _make_path(*parts: Any) -> str:
     """
     # TODO: maybe only allow some parts to be lists/tuples ?
     return "/" + "/".join(
-        # preserve ',' and '*' in url for nicer URLs in logs
-        quote(_escape(p), b",*")
+        _quote_str_path_part(p) if type(p) is str else _quote_path_part(p)
         for p in parts
         if p not in SKIP_IN_PATH
     )
@@ -245,13 +260,34 @@ def query_params(
     them in the params argument.
     """
 
+    # Position of every accepted query parameter, the 'params' of a call
+    # are ordered as the parameters were declared.
+    param_positions: Dict[str, int] = {}
+    for p in es_query_params + GLOBAL_PARAMS:
+        param_positions.setdefault(p, len(param_positions))
+    # Keyword arguments which aren't passed on to the method as they are,
+    # if none of them is given the method is called without any work.
+    special_kwargs = frozenset(param_positions).union(
+        (
+            "params",
+            "headers",
+            "opaque_id",
+            "http_auth",
+            "api_key",
+            "ignore",
+            "request_timeout",
+        )
+    )
+
     def _wrapper(func: Any) -> Any:
         @wraps(func)
         def _wrapped(*args: Any, **kwargs: Any) -> Any:
-            params = (kwargs.pop("params", None) or {}).copy()
+            if special_kwargs.isdisjoint(kwargs):
+                return func(*args, params={}, headers={}, **kwargs)
+
+            params = dict(kwargs.pop("params", None) or ())
             headers = {
-                k.lower(): v
-                for k, v in (kwargs.pop("headers", None) or {}).copy().items()
+                k.lower(): v for k, v in (kwargs.pop("headers", None) or {}).items()
             }
 
             if "opaque_id" in kwargs:
@@ -269,11 +305,13 @@ def query_params(
             elif api_key is not None:
                 headers["authorization"] = f"ApiKey {_base64_auth_header(api_key)}"
 
-            for p in es_query_params + GLOBAL_PARAMS:
-                if p in kwargs:
-                    v = kwargs.pop(p)
-                    if v is not None:
-                        params[p] = _escape(v)
+            query_kwargs = [p for p in kwargs if p in param_positions]
+            if len(query_kwargs) > 1:
+                query_kwargs.sort(key=param_positions.__getitem__)
+            for p in query_kwargs:
+                v = kwargs.pop(p)
+                if v is not None:
+                    params[p] = _escape(v)
 
             # don't treat ignore, request_timeout, and opaque_id as other params to avoid escaping
             for p in ("ignore", "request_timeout"):
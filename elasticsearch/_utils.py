@@ -30,5 +30,6 @@ def fixup_module_metadata(module_name: str, namespace: Dict[str, Any]) -> None:
                     fix_one(attr_value)
 
     for objname in namespace["__all__"]:
-        obj = namespace[objname]
-        fix_one(obj)
+        # Lazily imported objects are fixed up once they're imported
+        if objname in namespace:
+            fix_one(namespace[objname])
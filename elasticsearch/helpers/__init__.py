@@ -15,11 +15,30 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
-from .._async.helpers import async_bulk, async_reindex, async_scan, async_streaming_bulk
+from .._async.helpers import (
+    AsyncBulkProcessor,
+    async_bulk,
+    async_reindex,
+    async_scan,
+    async_streaming_bulk,
+)
 from .._utils import fixup_module_metadata
 from .actions import _chunk_actions  # noqa: F401
 from .actions import _process_bulk_chunk  # noqa: F401
-from .actions import bulk, expand_action, parallel_bulk, reindex, scan, streaming_bulk
+from .actions import (
+    BulkProcessor,
+    bulk,
+    bulk_from_arrow,
+    bulk_from_dataframe,
+    expand_action,
+    parallel_bulk,
+    parallel_scan,
+    pit_scan,
+    process_bulk,
+    reindex,
+    scan,
+    streaming_bulk,
+)
 from .errors import BulkIndexError, ScanError
 
 __all__ = [
@@ -28,13 +47,20 @@ __all__ = [
     "expand_action",
     "streaming_bulk",
     "bulk",
+    "bulk_from_dataframe",
+    "bulk_from_arrow",
+    "BulkProcessor",
     "parallel_bulk",
+    "process_bulk",
     "scan",
+    "parallel_scan",
+    "pit_scan",
     "reindex",
     "async_scan",
     "async_bulk",
     "async_reindex",
     "async_streaming_bulk",
+    "AsyncBulkProcessor",
 ]
 
 fixup_module_metadata(__name__, globals())
@@ -17,11 +17,17 @@
 
 import sys
 
+from .actions import BulkProcessor as BulkProcessor
 from .actions import _chunk_actions as _chunk_actions
 from .actions import _process_bulk_chunk as _process_bulk_chunk
 from .actions import bulk as bulk
+from .actions import bulk_from_arrow as bulk_from_arrow
+from .actions import bulk_from_dataframe as bulk_from_dataframe
 from .actions import expand_action as expand_action
 from .actions import parallel_bulk as parallel_bulk
+from .actions import parallel_scan as parallel_scan
+from .actions import pit_scan as pit_scan
+from .actions import process_bulk as process_bulk
 from .actions import reindex as reindex
 from .actions import scan as scan
 from .actions import streaming_bulk as streaming_bulk
@@ -29,6 +35,7 @@ from .errors import BulkIndexError as BulkIndexError
 from .errors import ScanError as ScanError
 
 try:
+    from .._async.helpers import AsyncBulkProcessor as AsyncBulkProcessor
     from .._async.helpers import async_bulk as async_bulk
     from .._async.helpers import async_reindex as async_reindex
     from .._async.helpers import async_scan as async_scan
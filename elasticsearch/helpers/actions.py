@@ -15,10 +15,17 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
+import heapq
 import logging
+import os
+import random
+import threading
 import time
+from collections import deque
+from io import BytesIO
+from itertools import count, islice
 from operator import methodcaller
-from queue import Queue
+from queue import Empty, Queue
 from typing import Mapping
 
 from ..compat import string_types, to_bytes
@@ -104,7 +111,7 @@ class _ActionChunker:
 
         self.size = 0
         self.action_count = 0
-        self.bulk_actions = []
+        self.bulk_actions = BytesIO()
         self.bulk_data = []
 
     def feed(self, action, data):
@@ -119,17 +126,16 @@ class _ActionChunker:
             cur_size += len(data) + 1
 
         # full chunk, send it and start a new one
-        if self.bulk_actions and (
-            self.size + cur_size > self.max_chunk_bytes
-            or self.action_count == self.chunk_size
-        ):
-            ret = (self.bulk_data, self.bulk_actions)
-            self.bulk_actions, self.bulk_data = [], []
-            self.size, self.action_count = 0, 0
+        if self.is_full(cur_size):
+            ret = self.flush()
 
-        self.bulk_actions.append(action)
+        # Lines are written directly into the request body so
+        # the chunk doesn't need to be joined again when sent.
+        self.bulk_actions.write(action)
+        self.bulk_actions.write(b"\n")
         if data is not None:
-            self.bulk_actions.append(data)
+            self.bulk_actions.write(data)
+            self.bulk_actions.write(b"\n")
             self.bulk_data.append((raw_action, raw_data))
         else:
             self.bulk_data.append((raw_action,))
@@ -138,23 +144,131 @@ class _ActionChunker:
         self.action_count += 1
         return ret
 
+    def feed_encoded(self, data, encoded):
+        """
+        Add an action which was already serialized, ``encoded`` are its
+        newline-terminated action and data lines.
+        """
+        ret = None
+        if self.is_full(len(encoded)):
+            ret = self.flush()
+
+        self.bulk_actions.write(encoded)
+        self.bulk_data.append(data)
+        self.size += len(encoded)
+        self.action_count += 1
+        return ret
+
+    def is_full(self, cur_size=0):
+        return bool(self.bulk_data) and (
+            self.size + cur_size > self.max_chunk_bytes
+            or self.action_count >= self.chunk_size
+        )
+
     def flush(self):
         ret = None
-        if self.bulk_actions:
-            ret = (self.bulk_data, self.bulk_actions)
-            self.bulk_actions, self.bulk_data = [], []
+        if self.bulk_data:
+            # getvalue() hands over the buffer without copying it as
+            # long as nothing else is written to it afterwards.
+            ret = (self.bulk_data, self.bulk_actions.getvalue())
+            self.bulk_actions, self.bulk_data = BytesIO(), []
+            self.size, self.action_count = 0, 0
         return ret
 
 
+class _AdaptiveChunkSize:
+    """
+    Adjust the number of actions per chunk to how long bulk requests take
+    and whether elasticsearch rejects documents (AIMD). While requests
+    complete within ``target_latency`` seconds the chunk size grows
+    linearly, on slow requests or rejections it's halved.
+    """
+
+    # number of actions added to the chunk size after every fast request
+    increase_step = 50
+
+    def __init__(
+        self,
+        min_chunk_size=10,
+        max_chunk_size=10000,
+        target_latency=1.0,
+        chunk_size=500,
+    ):
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.target_latency = target_latency
+        self.chunk_size = min(max(chunk_size, min_chunk_size), max_chunk_size)
+        self._lock = threading.Lock()
+
+    def record(self, action_count, latency, rejected):
+        with self._lock:
+            # Chunks well below the current size, like chunks of retried
+            # documents or the last chunk, say little about that size.
+            if action_count < self.chunk_size // 2:
+                return
+            if rejected or latency > self.target_latency:
+                # Chunks larger than the current size were in-flight at the
+                # same time as the one which shrank it, they don't shrink it
+                # a second time.
+                if action_count <= self.chunk_size:
+                    self.chunk_size = max(self.min_chunk_size, self.chunk_size // 2)
+            else:
+                self.chunk_size = min(
+                    self.max_chunk_size, self.chunk_size + self.increase_step
+                )
+
+    def measure(self, bulk_data, results):
+        """
+        Consume the results of :func:`_process_bulk_chunk` and record how long
+        the request took and whether any documents were rejected.
+        """
+        start = time.monotonic()
+        try:
+            results = list(results)
+        except TransportError as e:
+            self.record(len(bulk_data), time.monotonic() - start, e.status_code == 429)
+            raise
+        self.record(
+            len(bulk_data),
+            time.monotonic() - start,
+            any(not ok and _is_rejected(info) for ok, info in results),
+        )
+        return results
+
+
+def _is_rejected(info):
+    """
+    Whether a failed bulk item was rejected because elasticsearch is overloaded.
+    """
+    item = next(iter(info.values()))
+    error = item.get("error")
+    return item.get("status") == 429 or (
+        isinstance(error, dict)
+        and error.get("type") == "es_rejected_execution_exception"
+    )
+
+
+def _get_chunk_sizer(chunk_size, min_chunk_size, max_chunk_size, target_latency):
+    if chunk_size == "auto":
+        return _AdaptiveChunkSize(min_chunk_size, max_chunk_size, target_latency)
+    return None
+
+
 def _chunk_actions(actions, chunk_size, max_chunk_bytes, serializer):
     """
-    Split actions into chunks by number or size, serialize them into strings in
-    the process.
+    Split actions into chunks by number or size, serialize them into
+    newline-delimited bytes in the process. ``chunk_size`` can also be an
+    :class:`_AdaptiveChunkSize` which is followed for every new action.
     """
+    chunk_sizer = None
+    if isinstance(chunk_size, _AdaptiveChunkSize):
+        chunk_sizer, chunk_size = chunk_size, chunk_size.chunk_size
     chunker = _ActionChunker(
         chunk_size=chunk_size, max_chunk_bytes=max_chunk_bytes, serializer=serializer
     )
     for action, data in actions:
+        if chunk_sizer is not None:
+            chunker.chunk_size = chunk_sizer.chunk_size
         ret = chunker.feed(action, data)
         if ret:
             yield ret
@@ -163,6 +277,59 @@ def _chunk_actions(actions, chunk_size, max_chunk_bytes, serializer):
         yield ret
 
 
+def _split_bulk_body(bulk_actions, bulk_data):
+    """
+    Split a serialized chunk back into the lines of every action, so they can
+    be sent again without serializing them a second time. Serialized JSON
+    never contains a raw new line so each action is either one or two lines.
+    """
+    view = memoryview(bulk_actions)
+    lines = []
+    start = 0
+    for data in bulk_data:
+        end = bulk_actions.index(b"\n", start)
+        if len(data) > 1:
+            end = bulk_actions.index(b"\n", end + 1)
+        lines.append(view[start : end + 1])
+        start = end + 1
+    return lines
+
+
+# Options of the current process_bulk() worker process,
+# set once per process by _init_bulk_encoder()
+_bulk_encoder_options = None
+
+
+def _init_bulk_encoder(chunk_size, max_chunk_bytes, serializer, expand_action_callback):
+    global _bulk_encoder_options
+    _bulk_encoder_options = (
+        chunk_size,
+        max_chunk_bytes,
+        serializer,
+        expand_action_callback,
+    )
+
+
+def _encode_bulk_batch(actions):
+    """
+    Expand and serialize a batch of actions within a process_bulk() worker.
+    """
+    (
+        chunk_size,
+        max_chunk_bytes,
+        serializer,
+        expand_action_callback,
+    ) = _bulk_encoder_options
+    return list(
+        _chunk_actions(
+            map(expand_action_callback, actions),
+            chunk_size,
+            max_chunk_bytes,
+            serializer,
+        )
+    )
+
+
 def _process_bulk_chunk_success(resp, bulk_data, ignore_status, raise_on_error=True):
     # if raise on error is set, we need to collect errors per chunk before raising them
     errors = []
@@ -197,26 +364,31 @@ def _process_bulk_chunk_error(
         raise error
 
     # if we are not propagating, mark all actions in current chunk as failed
+    exc_errors = _failed_actions(error, bulk_data, error.status_code)
+
+    # emulate standard behavior for failed actions
+    if raise_on_error and error.status_code not in ignore_status:
+        raise BulkIndexError(
+            "%i document(s) failed to index." % len(exc_errors), exc_errors
+        )
+    else:
+        for err in exc_errors:
+            yield False, err
+
+
+def _failed_actions(error, bulk_data, status_code):
     err_message = str(error)
     exc_errors = []
 
     for data in bulk_data:
         # collect all the information about failed actions
         op_type, action = data[0].copy().popitem()
-        info = {"error": err_message, "status": error.status_code, "exception": error}
+        info = {"error": err_message, "status": status_code, "exception": error}
         if op_type != "delete":
             info["data"] = data[1]
         info.update(action)
         exc_errors.append({op_type: info})
-
-    # emulate standard behavior for failed actions
-    if raise_on_error and error.status_code not in ignore_status:
-        raise BulkIndexError(
-            "%i document(s) failed to index." % len(exc_errors), exc_errors
-        )
-    else:
-        for err in exc_errors:
-            yield False, err
+    return exc_errors
 
 
 def _process_bulk_chunk(
@@ -263,6 +435,214 @@ def _add_helper_meta_to_kwargs(kwargs, helper_meta):
     return kwargs
 
 
+def _retry_backoff(attempt, initial_backoff, max_backoff):
+    """
+    Number of seconds to wait before retrying rejected documents, it's
+    chosen randomly between half and the full exponential backoff so that
+    documents rejected at the same time aren't retried at the same time.
+    """
+    backoff = min(max_backoff, initial_backoff * 2 ** (attempt - 1))
+    return random.uniform(backoff / 2, backoff)
+
+
+def _streaming_bulk_chunks(
+    client,
+    chunks,
+    serializer,
+    chunk_size=500,
+    max_chunk_bytes=100 * 1024 * 1024,
+    raise_on_error=True,
+    raise_on_exception=True,
+    max_retries=0,
+    initial_backoff=2,
+    max_backoff=600,
+    yield_ok=True,
+    ignore_status=(),
+    pipeline_depth=1,
+    *args,
+    spool=None,
+    **kwargs,
+):
+    """
+    Send serialized chunks to elasticsearch, keeping up to ``pipeline_depth``
+    of them in-flight, and yield the results per action.
+
+    Documents rejected with a ``429`` status code are collected into retry
+    chunks per attempt using their already serialized lines. A retry chunk
+    is due once the backoff of its first document has passed, it's sent
+    then even if it isn't full. New chunks are sent in the meantime, only
+    when there's nothing else to do the next due retry chunk is waited for.
+
+    When ``chunk_size`` is an :class:`_AdaptiveChunkSize` every request is
+    measured so the size of the following chunks can be adjusted.
+
+    With a :class:`_BulkSpool` the chunks also contain the segment they were
+    written to, which is removed once every action of the chunk has a result.
+    """
+    chunk_sizer = None
+    if isinstance(chunk_size, _AdaptiveChunkSize):
+        chunk_sizer = chunk_size
+
+    pool = None
+    if pipeline_depth > 1:
+        # Avoid importing multiprocessing unless pipelining is used
+        # to avoid exceptions on restricted environments like App Engine
+        from multiprocessing.pool import ThreadPool
+
+        pool = ThreadPool(pipeline_depth)
+
+    # Partially filled chunks of rejected documents per attempt and when
+    # they're due. The heap holds the due time of every retry chunk, both
+    # the full ones and the partially filled ones (without bulk_data).
+    retry_chunkers = {}
+    retry_chunks = []
+    # Keeps heap entries with the same due time from being compared
+    sequence = count()
+    # Chunks which were sent, in the order they were sent.
+    pending = deque()
+    # Segment of every spooled action without a result and the
+    # number of such actions per segment.
+    segments = {}
+    segment_sizes = {}
+
+    def retry_due(attempt):
+        return time.monotonic() + _retry_backoff(attempt, initial_backoff, max_backoff)
+
+    def schedule_retry(due, bulk_data, bulk_actions, attempt):
+        heapq.heappush(
+            retry_chunks, (due, next(sequence), bulk_data, bulk_actions, attempt)
+        )
+
+    def send_chunk(bulk_data, bulk_actions, attempt):
+        results = _process_bulk_chunk(
+            client,
+            bulk_actions,
+            bulk_data,
+            raise_on_exception,
+            raise_on_error,
+            ignore_status,
+            *args,
+            **kwargs,
+        )
+        if chunk_sizer is not None:
+            results = chunk_sizer.measure(bulk_data, results)
+        return results
+
+    def retry(data, encoded, attempt):
+        if attempt not in retry_chunkers:
+            chunker = _ActionChunker(chunk_size, max_chunk_bytes, serializer)
+            due = retry_due(attempt)
+            retry_chunkers[attempt] = chunker, due
+            # the chunk is sent once it's due even if it isn't full
+            schedule_retry(due, None, chunker, attempt)
+        chunker, due = retry_chunkers[attempt]
+        if chunk_sizer is not None:
+            chunker.chunk_size = chunk_sizer.chunk_size
+        ret = chunker.feed_encoded(data, encoded)
+        if ret:
+            schedule_retry(due, *ret, attempt)
+        # don't wait for the next rejection to complete a full chunk
+        if chunker.action_count >= chunker.chunk_size:
+            schedule_retry(due, *chunker.flush(), attempt)
+        if not chunker.bulk_data:
+            del retry_chunkers[attempt]
+
+    def track_segment(bulk_data, segment):
+        for data in bulk_data:
+            segments[id(data)] = segment
+        segment_sizes[segment] = len(bulk_data)
+
+    def complete(data):
+        if spool is None:
+            return
+        segment = segments.pop(id(data))
+        segment_sizes[segment] -= 1
+        if not segment_sizes[segment]:
+            del segment_sizes[segment]
+            spool.remove(segment)
+
+    def process_results(bulk_data, bulk_actions, attempt, results):
+        lines = None
+        try:
+            if pool is not None:
+                results = results.get()
+            for i, (data, (ok, info)) in enumerate(zip(bulk_data, results)):
+                if not ok:
+                    action, info = info.popitem()
+                    # retry if retries enabled, we get 429, and we are not
+                    # in the last attempt
+                    if info["status"] == 429 and attempt < max_retries:
+                        if lines is None:
+                            lines = _split_bulk_body(bulk_actions, bulk_data)
+                        retry(data, lines[i], attempt + 1)
+                    else:
+                        complete(data)
+                        yield ok, {action: info}
+                else:
+                    complete(data)
+                    if yield_ok:
+                        yield ok, info
+
+        except TransportError as e:
+            # suppress 429 errors since we will retry them
+            if attempt == max_retries or e.status_code != 429:
+                raise
+            schedule_retry(retry_due(attempt + 1), bulk_data, bulk_actions, attempt + 1)
+
+    chunks = iter(chunks)
+    try:
+        while True:
+            if retry_chunks and retry_chunks[0][0] <= time.monotonic():
+                _, _, bulk_data, bulk_actions, attempt = heapq.heappop(retry_chunks)
+                if bulk_data is None:
+                    # a partially filled chunk is due, later rejections
+                    # are collected into a new one.
+                    chunker = bulk_actions
+                    if retry_chunkers.get(attempt, (None,))[0] is chunker:
+                        del retry_chunkers[attempt]
+                    chunk = chunker.flush()
+                    if chunk is None:
+                        # it was sent already once it was full
+                        continue
+                    bulk_data, bulk_actions = chunk
+            else:
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    bulk_data, bulk_actions, attempt = chunk[0], chunk[1], 0
+                    if spool is not None:
+                        track_segment(bulk_data, chunk[2])
+                elif pending:
+                    # in-flight chunks can still have rejected documents
+                    yield from process_results(*pending.popleft())
+                    continue
+                elif retry_chunks:
+                    # nothing else left to send, wait for the next retry
+                    time.sleep(max(0, retry_chunks[0][0] - time.monotonic()))
+                    continue
+                else:
+                    break
+
+            if pool is None:
+                results = send_chunk(bulk_data, bulk_actions, attempt)
+            else:
+                results = pool.apply_async(
+                    lambda *chunk: list(send_chunk(*chunk)),
+                    (bulk_data, bulk_actions, attempt),
+                )
+            pending.append((bulk_data, bulk_actions, attempt, results))
+
+            # Results are yielded in the order the chunks were sent,
+            # the next chunk is only serialized once there's room
+            # in the pipeline.
+            if len(pending) >= pipeline_depth:
+                yield from process_results(*pending.popleft())
+
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+
 def streaming_bulk(
     client,
     actions,
@@ -277,6 +657,11 @@ def streaming_bulk(
     yield_ok=True,
     ignore_status=(),
     *args,
+    min_chunk_size=10,
+    max_chunk_size=10000,
+    target_latency=1.0,
+    pipeline_depth=1,
+    spool_dir=None,
     **kwargs,
 ):
 
@@ -288,14 +673,21 @@ def streaming_bulk(
     entire input is consumed and sent.
 
     If you specify ``max_retries`` it will also retry any documents that were
-    rejected with a ``429`` status code. To do this it will wait (**by calling
-    time.sleep which will block**) for ``initial_backoff`` seconds and then,
-    every subsequent rejection for the same chunk, for double the time every
-    time up to ``max_backoff`` seconds.
+    rejected with a ``429`` status code. Rejected documents are collected into
+    new chunks, without serializing them again, which are retried
+    ``initial_backoff`` seconds after they were rejected and then, every
+    subsequent rejection for the same documents, after double the time every
+    time up to ``max_backoff`` seconds. The backoff is randomly shortened by
+    up to half so retries are spread out. New chunks keep being sent while
+    rejected documents wait, only when there's nothing else left to send it
+    will wait (**by calling time.sleep which will block**) for the next
+    retry. Results of retried documents are yielded once they are retried.
 
     :arg client: instance of :class:`~elasticsearch.Elasticsearch` to use
     :arg actions: iterable containing the actions to be executed
-    :arg chunk_size: number of docs in one chunk sent to es (default: 500)
+    :arg chunk_size: number of docs in one chunk sent to es (default: 500), or
+        ``"auto"`` to adjust it to how long requests take (see
+        ``target_latency``)
     :arg max_chunk_bytes: the maximum size of the request in bytes (default: 100MB)
     :arg raise_on_error: raise ``BulkIndexError`` containing errors (as `.errors`)
         from the execution of the last chunk when some occur. By default we raise.
@@ -312,64 +704,63 @@ def streaming_bulk(
     :arg max_backoff: maximum number of seconds a retry will wait
     :arg yield_ok: if set to False will skip successful documents in the output
     :arg ignore_status: list of HTTP status code that you want to ignore
+    :arg pipeline_depth: number of chunks that can be in-flight at the same
+        time. While chunks are being sent the next ones are serialized, results
+        are still yielded in the same order as the chunks were sent. Retried
+        chunks count towards the limit as well. Set to 1 (default) to send one
+        chunk at a time.
+    :arg min_chunk_size: smallest number of docs in one chunk when
+        ``chunk_size="auto"`` (default: 10)
+    :arg max_chunk_size: largest number of docs in one chunk when
+        ``chunk_size="auto"`` (default: 10000)
+    :arg target_latency: when ``chunk_size="auto"``, chunks grow by a fixed
+        number of docs while requests take at most this many seconds (default:
+        1.0) and are halved when a request takes longer or documents are
+        rejected because elasticsearch is overloaded.
+    :arg spool_dir: directory of a write-ahead log of the chunks, see below
+
+    With a ``spool_dir`` every chunk is written to a segment file in that
+    directory before it's sent. Once every action of the chunk has a result,
+    including the rejected ones which were retried, the segment is removed.
+    Segments left behind by a process which died, or by a call which raised
+    an exception, are sent again before the new actions by the next call
+    with the same ``spool_dir``. Actions are therefore sent at least once,
+    use explicit ``_id`` values to avoid duplicate documents. A directory
+    must only be used by one call at a time.
     """
     client = client.options()
     client._client_meta = (("h", "bp"),)
 
     actions = map(expand_action_callback, actions)
     serializer = client.transport.serializers.get_serializer("application/json")
-
-    for bulk_data, bulk_actions in _chunk_actions(
-        actions, chunk_size, max_chunk_bytes, serializer
-    ):
-
-        for attempt in range(max_retries + 1):
-            to_retry, to_retry_data = [], []
-            if attempt:
-                time.sleep(min(max_backoff, initial_backoff * 2 ** (attempt - 1)))
-
-            try:
-                for data, (ok, info) in zip(
-                    bulk_data,
-                    _process_bulk_chunk(
-                        client,
-                        bulk_actions,
-                        bulk_data,
-                        raise_on_exception,
-                        raise_on_error,
-                        ignore_status,
-                        *args,
-                        **kwargs,
-                    ),
-                ):
-
-                    if not ok:
-                        action, info = info.popitem()
-                        # retry if retries enabled, we get 429, and we are not
-                        # in the last attempt
-                        if (
-                            max_retries
-                            and info["status"] == 429
-                            and (attempt + 1) <= max_retries
-                        ):
-                            # _process_bulk_chunk expects strings so we need to
-                            # re-serialize the data
-                            to_retry.extend(map(serializer.dumps, data))
-                            to_retry_data.append(data)
-                        else:
-                            yield ok, {action: info}
-                    elif yield_ok:
-                        yield ok, info
-
-            except TransportError as e:
-                # suppress 429 errors since we will retry them
-                if attempt == max_retries or e.status_code != 429:
-                    raise
-            else:
-                if not to_retry:
-                    break
-                # retry only subset of documents that didn't succeed
-                bulk_actions, bulk_data = to_retry, to_retry_data
+    chunk_size = (
+        _get_chunk_sizer(chunk_size, min_chunk_size, max_chunk_size, target_latency)
+        or chunk_size
+    )
+    chunks = _chunk_actions(actions, chunk_size, max_chunk_bytes, serializer)
+    spool = None
+    if spool_dir is not None:
+        spool = _BulkSpool(spool_dir)
+        chunks = _spool_chunks(spool, chunks, serializer)
+
+    yield from _streaming_bulk_chunks(
+        client,
+        chunks,
+        serializer,
+        chunk_size,
+        max_chunk_bytes,
+        raise_on_error,
+        raise_on_exception,
+        max_retries,
+        initial_backoff,
+        max_backoff,
+        yield_ok,
+        ignore_status,
+        pipeline_depth,
+        *args,
+        spool=spool,
+        **kwargs,
+    )
 
 
 def bulk(client, actions, stats_only=False, ignore_status=(), *args, **kwargs):
@@ -401,16 +792,21 @@ def bulk(client, actions, stats_only=False, ignore_status=(), *args, **kwargs):
     the operation, see :func:`~elasticsearch.helpers.streaming_bulk` for more
     accepted parameters.
     """
+    # make streaming_bulk yield successful results so we can count them
+    kwargs["yield_ok"] = True
+    return _summarize_bulk_results(
+        streaming_bulk(client, actions, ignore_status=ignore_status, *args, **kwargs),
+        stats_only,
+    )
+
+
+def _summarize_bulk_results(results, stats_only):
     success, failed = 0, 0
 
     # list of errors to be collected is not stats_only
     errors = []
 
-    # make streaming_bulk yield successful results so we can count them
-    kwargs["yield_ok"] = True
-    for ok, item in streaming_bulk(
-        client, actions, ignore_status=ignore_status, *args, **kwargs
-    ):
+    for ok, item in results:
         # go through request-response pairs and detect failures
         if not ok:
             if not stats_only:
@@ -432,15 +828,32 @@ def parallel_bulk(
     expand_action_callback=expand_action,
     ignore_status=(),
     *args,
+    min_chunk_size=10,
+    max_chunk_size=10000,
+    target_latency=1.0,
+    raise_on_error=True,
+    raise_on_exception=True,
+    max_retries=0,
+    initial_backoff=2,
+    max_backoff=600,
+    ordered=True,
     **kwargs,
 ):
     """
     Parallel version of the bulk helper run in multiple threads at once.
 
+    If you specify ``max_retries`` documents rejected with a ``429`` status
+    code are retried the same way as by
+    :func:`~elasticsearch.helpers.streaming_bulk`, within the thread which sent
+    them. Only that thread waits for the backoff, the other threads keep
+    sending chunks.
+
     :arg client: instance of :class:`~elasticsearch.Elasticsearch` to use
     :arg actions: iterator containing the actions
     :arg thread_count: size of the threadpool to use for the bulk requests
-    :arg chunk_size: number of docs in one chunk sent to es (default: 500)
+    :arg chunk_size: number of docs in one chunk sent to es (default: 500), or
+        ``"auto"`` to adjust it to how long requests take (see
+        ``target_latency``)
     :arg max_chunk_bytes: the maximum size of the request in bytes (default: 100MB)
     :arg raise_on_error: raise ``BulkIndexError`` containing errors (as `.errors`)
         from the execution of the last chunk when some occur. By default we raise.
@@ -452,6 +865,23 @@ def parallel_bulk(
     :arg queue_size: size of the task queue between the main thread (producing
         chunks to send) and the processing threads.
     :arg ignore_status: list of HTTP status code that you want to ignore
+    :arg min_chunk_size: smallest number of docs in one chunk when
+        ``chunk_size="auto"`` (default: 10)
+    :arg max_chunk_size: largest number of docs in one chunk when
+        ``chunk_size="auto"`` (default: 10000)
+    :arg target_latency: when ``chunk_size="auto"``, chunks grow by a fixed
+        number of docs while requests take at most this many seconds (default:
+        1.0) and are halved when a request takes longer or documents are
+        rejected because elasticsearch is overloaded.
+    :arg max_retries: maximum number of times a document will be retried when
+        ``429`` is received, set to 0 (default) for no retries on ``429``
+    :arg initial_backoff: number of seconds we should wait before the first
+        retry. Any subsequent retries will be powers of ``initial_backoff *
+        2**retry_number``
+    :arg max_backoff: maximum number of seconds a retry will wait
+    :arg ordered: yield the results in the order of the chunks (default:
+        ``True``), set to ``False`` to yield the results of every chunk as
+        soon as it completes so a slow chunk doesn't hold back the others
     """
     # Avoid importing multiprocessing unless parallel_bulk is used
     # to avoid exceptions on restricted environments like App Engine
@@ -459,6 +889,32 @@ def parallel_bulk(
 
     actions = map(expand_action_callback, actions)
     serializer = client.transport.serializers.get_serializer("application/json")
+    chunk_sizer = _get_chunk_sizer(
+        chunk_size, min_chunk_size, max_chunk_size, target_latency
+    )
+
+    def process_chunk(bulk_chunk):
+        # Results are collected within the thread, including the ones of
+        # retried documents, so they can be handed over to the caller.
+        return list(
+            _streaming_bulk_chunks(
+                client,
+                (bulk_chunk,),
+                serializer,
+                chunk_sizer or chunk_size,
+                max_chunk_bytes,
+                raise_on_error,
+                raise_on_exception,
+                max_retries,
+                initial_backoff,
+                max_backoff,
+                True,
+                ignore_status,
+                1,
+                *args,
+                **kwargs,
+            )
+        )
 
     class BlockingPool(ThreadPool):
         def _setup_queues(self):
@@ -471,18 +927,11 @@ def parallel_bulk(
     pool = BlockingPool(thread_count)
 
     try:
-        for result in pool.imap(
-            lambda bulk_chunk: list(
-                _process_bulk_chunk(
-                    client,
-                    bulk_chunk[1],
-                    bulk_chunk[0],
-                    ignore_status=ignore_status,
-                    *args,
-                    **kwargs,
-                )
+        for result in (pool.imap if ordered else pool.imap_unordered)(
+            process_chunk,
+            _chunk_actions(
+                actions, chunk_sizer or chunk_size, max_chunk_bytes, serializer
             ),
-            _chunk_actions(actions, chunk_size, max_chunk_bytes, serializer),
         ):
             yield from result
 
@@ -491,6 +940,755 @@ def parallel_bulk(
         pool.join()
 
 
+def process_bulk(
+    client,
+    actions,
+    process_count=None,
+    pipeline_depth=4,
+    chunk_size=500,
+    max_chunk_bytes=100 * 1024 * 1024,
+    queue_size=4,
+    expand_action_callback=expand_action,
+    ignore_status=(),
+    **kwargs,
+):
+    """
+    Version of the bulk helper which expands and serializes the actions in
+    multiple worker processes. Use this helper instead of
+    :func:`~elasticsearch.helpers.parallel_bulk` when preparing the documents
+    is CPU bound, serialization in threads doesn't scale because of the GIL.
+
+    The workers send back the serialized chunks and the requests are sent
+    from the current process using the connections of ``client``. Because
+    actions and the ``expand_action_callback`` are sent to other processes
+    they must be picklable, for example ``expand_action_callback`` can't be a
+    lambda.
+
+    Results are yielded as their chunks complete, documents which were
+    rejected and retried come after the ones sent later, so they aren't in
+    the same order as the actions. Every result is ``(ok, {op_type: item})``
+    with the item of the bulk response, including ``_index`` and ``_id``,
+    and for failed actions the document as ``data``. Use them to correlate
+    results with actions.
+
+    :arg client: instance of :class:`~elasticsearch.Elasticsearch` to use
+    :arg actions: iterator containing the actions
+    :arg process_count: number of worker processes used to serialize the
+        actions, defaults to the number of CPUs
+    :arg pipeline_depth: number of chunks that can be in-flight at the same
+        time (default: 4)
+    :arg chunk_size: number of docs in one chunk sent to es (default: 500)
+    :arg max_chunk_bytes: the maximum size of the request in bytes (default: 100MB)
+    :arg queue_size: number of batches of actions waiting to be serialized
+        per worker process.
+    :arg expand_action_callback: callback executed on each action passed in,
+        should return a tuple containing the action line and the data line
+        (`None` if data line should be omitted).
+    :arg ignore_status: list of HTTP status code that you want to ignore
+
+    Any additional keyword arguments will be passed to
+    :func:`~elasticsearch.helpers.streaming_bulk` when sending the chunks,
+    see :func:`~elasticsearch.helpers.streaming_bulk` for more accepted
+    parameters.
+    """
+    # Avoid importing multiprocessing unless process_bulk is used
+    # to avoid exceptions on restricted environments like App Engine
+    from multiprocessing import Pool
+
+    client = client.options()
+    client._client_meta = (("h", "bp"),)
+
+    serializer = client.transport.serializers.get_serializer("application/json")
+    process_count = process_count or os.cpu_count() or 1
+
+    actions = iter(actions)
+    batches = iter(lambda: list(islice(actions, chunk_size)), [])
+
+    pool = Pool(
+        process_count,
+        initializer=_init_bulk_encoder,
+        initargs=(chunk_size, max_chunk_bytes, serializer, expand_action_callback),
+    )
+
+    def encoded_chunks():
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.apply_async(_encode_bulk_batch, (batch,)))
+            if len(pending) >= queue_size * process_count:
+                yield from pending.popleft().get()
+
+        while pending:
+            yield from pending.popleft().get()
+
+    try:
+        yield from _streaming_bulk_chunks(
+            client,
+            encoded_chunks(),
+            serializer,
+            chunk_size,
+            max_chunk_bytes,
+            ignore_status=ignore_status,
+            pipeline_depth=pipeline_depth,
+            **kwargs,
+        )
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _encode_dataframes(
+    dataframes,
+    op_type,
+    index,
+    id_column,
+    index_column,
+    routing_column,
+    chunk_size,
+    max_chunk_bytes,
+    serializer,
+):
+    """
+    Split DataFrames into chunks of serialized actions. The documents of each
+    DataFrame are serialized column-wise by pandas, only the action lines are
+    serialized per row.
+    """
+    if op_type not in ("index", "create", "update", "delete"):
+        raise ValueError(f"Unsupported op_type {op_type!r}")
+
+    meta_columns = {
+        key: column
+        for key, column in (
+            ("_id", id_column),
+            ("_index", index_column),
+            ("routing", routing_column),
+        )
+        if column is not None
+    }
+    base_meta = {} if index is None else {"_index": index}
+    chunker = _ActionChunker(chunk_size, max_chunk_bytes, serializer)
+
+    for dataframe in dataframes:
+        if not len(dataframe):
+            continue
+
+        if op_type == "delete":
+            sources = [None] * len(dataframe)
+        else:
+            sources = (
+                dataframe.drop(columns=list(meta_columns.values()))
+                .to_json(
+                    orient="records",
+                    lines=True,
+                    date_format="iso",
+                    force_ascii=False,
+                )
+                .encode("utf-8")
+                .splitlines()
+            )
+
+        if meta_columns:
+            rows = zip(
+                *(dataframe[column].tolist() for column in meta_columns.values())
+            )
+        else:
+            rows = [()] * len(dataframe)
+            # every row has the same action line
+            action = {op_type: base_meta}
+            action_line = to_bytes(serializer.dumps(action), "utf-8") + b"\n"
+
+        for values, source in zip(rows, sources):
+            if meta_columns:
+                meta = base_meta.copy()
+                for key, value in zip(meta_columns, values):
+                    # missing values (None or NaN) are left out
+                    if value is not None and value == value:
+                        meta[key] = value
+                action = {op_type: meta}
+                action_line = to_bytes(serializer.dumps(action), "utf-8") + b"\n"
+
+            if source is None:
+                ret = chunker.feed_encoded((action,), action_line)
+            else:
+                if op_type == "update":
+                    source = b'{"doc":' + source + b"}"
+                ret = chunker.feed_encoded(
+                    (action, source), action_line + source + b"\n"
+                )
+            if ret:
+                yield ret
+
+    ret = chunker.flush()
+    if ret:
+        yield ret
+
+
+def bulk_from_dataframe(
+    client,
+    dataframe,
+    index=None,
+    op_type="index",
+    id_column=None,
+    index_column=None,
+    routing_column=None,
+    batch_size=10000,
+    chunk_size=500,
+    max_chunk_bytes=100 * 1024 * 1024,
+    stats_only=False,
+    **kwargs,
+):
+    """
+    Index the rows of a pandas ``DataFrame`` as documents without creating a
+    ``dict`` per row. Rows are serialized by pandas in batches of
+    ``batch_size`` rows using ``DataFrame.to_json()``. Returns the same
+    summary as :func:`~elasticsearch.helpers.bulk`.
+
+    Documents are serialized by pandas rather than by the client's
+    serializer: missing values become ``null``, dates are ISO 8601 strings
+    with millisecond precision and the index of the ``DataFrame`` isn't
+    included. In errors the ``data`` of a document is its serialized JSON.
+
+    :arg client: instance of :class:`~elasticsearch.Elasticsearch` to use
+    :arg dataframe: ``pandas.DataFrame`` with a document per row
+    :arg index: index of all documents, unless ``index_column`` is given
+    :arg op_type: one of ``index`` (default), ``create``, ``update`` to
+        update the documents with the fields of the rows, or ``delete``
+    :arg id_column: column with the ``_id`` of each document
+    :arg index_column: column with the ``_index`` of each document
+    :arg routing_column: column with the ``routing`` of each document
+    :arg batch_size: number of rows serialized at once (default: 10000)
+    :arg chunk_size: number of docs in one chunk sent to es (default: 500)
+    :arg max_chunk_bytes: the maximum size of the request in bytes (default: 100MB)
+    :arg stats_only: if `True` only report number of successful/failed
+        operations instead of just number of successful and a list of error responses
+
+    The columns with metadata aren't included in the documents, missing values
+    in them are left out of the action. Any additional keyword arguments
+    will be passed to :func:`~elasticsearch.helpers.streaming_bulk` when
+    sending the chunks, see :func:`~elasticsearch.helpers.streaming_bulk` for
+    more accepted parameters.
+    """
+    dataframes = (
+        dataframe.iloc[start : start + batch_size]
+        for start in range(0, len(dataframe), batch_size)
+    )
+    return _bulk_from_dataframes(
+        client,
+        dataframes,
+        index,
+        op_type,
+        id_column,
+        index_column,
+        routing_column,
+        chunk_size,
+        max_chunk_bytes,
+        stats_only,
+        **kwargs,
+    )
+
+
+def bulk_from_arrow(
+    client,
+    table,
+    index=None,
+    op_type="index",
+    id_column=None,
+    index_column=None,
+    routing_column=None,
+    batch_size=10000,
+    chunk_size=500,
+    max_chunk_bytes=100 * 1024 * 1024,
+    stats_only=False,
+    **kwargs,
+):
+    """
+    Index the rows of a ``pyarrow.Table`` as documents. The table is converted
+    to pandas one record batch of at most ``batch_size`` rows at a time,
+    otherwise it's the same as :func:`~elasticsearch.helpers.bulk_from_dataframe`
+    which describes all the parameters. Requires pandas to be installed.
+
+    :arg client: instance of :class:`~elasticsearch.Elasticsearch` to use
+    :arg table: ``pyarrow.Table`` with a document per row
+    """
+    dataframes = (
+        batch.to_pandas() for batch in table.to_batches(max_chunksize=batch_size)
+    )
+    return _bulk_from_dataframes(
+        client,
+        dataframes,
+        index,
+        op_type,
+        id_column,
+        index_column,
+        routing_column,
+        chunk_size,
+        max_chunk_bytes,
+        stats_only,
+        **kwargs,
+    )
+
+
+def _bulk_from_dataframes(
+    client,
+    dataframes,
+    index,
+    op_type,
+    id_column,
+    index_column,
+    routing_column,
+    chunk_size,
+    max_chunk_bytes,
+    stats_only,
+    **kwargs,
+):
+    client = client.options()
+    client._client_meta = (("h", "bp"),)
+
+    serializer = client.transport.serializers.get_serializer("application/json")
+    chunks = _encode_dataframes(
+        dataframes,
+        op_type,
+        index,
+        id_column,
+        index_column,
+        routing_column,
+        chunk_size,
+        max_chunk_bytes,
+        serializer,
+    )
+    # make _streaming_bulk_chunks yield successful results so we can count them
+    kwargs["yield_ok"] = True
+    return _summarize_bulk_results(
+        _streaming_bulk_chunks(
+            client, chunks, serializer, chunk_size, max_chunk_bytes, **kwargs
+        ),
+        stats_only,
+    )
+
+
+def _parse_bulk_body(bulk_actions, serializer):
+    """
+    Parse a serialized chunk back into the data of its actions, the
+    opposite of :meth:`_ActionChunker.feed`. Incomplete lines and actions at
+    the end, like the last ones written by a process which died, are left
+    out of both the data and the returned body.
+    """
+    lines = bulk_actions.split(b"\n")[:-1]
+    bulk_data = []
+    size = i = 0
+    while i < len(lines):
+        action = serializer.loads(lines[i])
+        if next(iter(action)) == "delete":
+            data = (action,)
+        elif i + 1 < len(lines):
+            data = (action, serializer.loads(lines[i + 1]))
+        else:
+            break
+        bulk_data.append(data)
+        for line in lines[i : i + len(data)]:
+            size += len(line) + 1
+        i += len(data)
+    return bulk_data, bulk_actions[:size]
+
+
+class _BulkSpool:
+    """
+    Write-ahead log of the actions of a :class:`BulkProcessor` or of
+    :func:`streaming_bulk`. Actions are appended to the current segment file
+    as they're added, a segment is sealed once its chunk is sent and removed
+    once the chunk was processed. Segments are numbered so they're replayed
+    in the order they were written.
+    """
+
+    suffix = ".ndjson"
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._segments = sorted(
+            int(name[: -len(self.suffix)])
+            for name in os.listdir(directory)
+            if name.endswith(self.suffix) and name[: -len(self.suffix)].isdigit()
+        )
+        self._next_segment = max(self._segments, default=0) + 1
+        self._segment = None
+        self._file = None
+
+    def _path(self, segment):
+        return os.path.join(self.directory, "%020d%s" % (segment, self.suffix))
+
+    def replay(self):
+        """
+        Yield the segments left behind by a previous processor and their
+        content.
+        """
+        for segment in self._segments:
+            with open(self._path(segment), "rb") as f:
+                yield segment, f.read()
+        self._segments = []
+
+    def write(self, encoded):
+        if self._file is None:
+            self._segment, self._next_segment = (
+                self._next_segment,
+                self._next_segment + 1,
+            )
+            self._file = open(self._path(self._segment), "ab")
+        # Flushed so the action survives the process dying, it's only
+        # synced to disk once the segment is sealed.
+        self._file.write(encoded)
+        self._file.flush()
+
+    def seal(self):
+        """
+        Sync and close the current segment, its actions are being sent.
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+        return self._segment
+
+    def remove(self, segment):
+        os.remove(self._path(segment))
+
+
+def _spool_chunks(spool, chunks, serializer):
+    """
+    Yield the chunks left behind in ``spool`` by a previous call and then
+    ``chunks``, each of them written to a segment first, along with their
+    segment.
+    """
+    for segment, bulk_actions in spool.replay():
+        bulk_data, bulk_actions = _parse_bulk_body(bulk_actions, serializer)
+        if bulk_data:
+            yield bulk_data, bulk_actions, segment
+        else:
+            spool.remove(segment)
+    for bulk_data, bulk_actions in chunks:
+        spool.write(bulk_actions)
+        yield bulk_data, bulk_actions, spool.seal()
+
+
+class BulkProcessor:
+    """
+    Buffer actions added one at a time, from any number of threads, and send
+    them to elasticsearch in the background. Use it instead of
+    :func:`~elasticsearch.helpers.streaming_bulk` when the actions aren't
+    available as an iterable, for example in a long-running service.
+
+    A chunk is sent as soon as it contains ``chunk_size`` actions or
+    ``max_chunk_bytes`` bytes, buffered actions are also sent every
+    ``flush_interval`` seconds. Up to ``concurrent_requests`` chunks are sent
+    at the same time, once that many chunks are waiting to be sent as well
+    :meth:`add` blocks until there's room again.
+
+    Results are reported per action to ``success_callback`` and
+    ``error_callback``, which are called from the threads sending the
+    requests. Failed actions are never raised, without an ``error_callback``
+    they're logged instead. Call :meth:`close` or use the processor as a
+    context manager to send the remaining actions::
+
+        with BulkProcessor(client, error_callback=errors.append) as processor:
+            for doc in docs:
+                processor.add({"_index": "my-index", "_source": doc})
+
+    :arg client: instance of :class:`~elasticsearch.Elasticsearch` to use
+    :arg chunk_size: number of docs in one chunk sent to es (default: 500)
+    :arg max_chunk_bytes: the maximum size of the request in bytes (default: 100MB)
+    :arg flush_interval: number of seconds after which buffered actions are
+        sent even when the chunk isn't full (default: 5.0), ``None`` to only
+        send full chunks
+    :arg concurrent_requests: number of chunks that can be in-flight at the
+        same time (default: 1)
+    :arg expand_action_callback: callback executed on each action passed in,
+        should return a tuple containing the action line and the data line
+        (`None` if data line should be omitted).
+    :arg success_callback: called with the result of every action which
+        succeeded
+    :arg error_callback: called with the error of every action which failed,
+        including the actions of requests which raised an exception
+    :arg ignore_status: list of HTTP status code that you want to ignore
+    :arg spool_dir: directory of a write-ahead log of the actions, see below
+
+    Any additional keyword arguments, like ``max_retries``, are handled the
+    same way as by :func:`~elasticsearch.helpers.streaming_bulk`.
+
+    With a ``spool_dir`` every action is appended to a segment file in that
+    directory before it's buffered, there's one segment per chunk. Once
+    elasticsearch responded to the chunk, including its retries, the
+    segment is removed. Segments left behind by a process which died, or of
+    requests which raised an exception, are sent again when a processor is
+    created with the same ``spool_dir``. Actions are therefore sent at least
+    once, use explicit ``_id`` values to avoid duplicate documents. A
+    directory must only be used by one processor at a time.
+    """
+
+    def __init__(
+        self,
+        client,
+        chunk_size=500,
+        max_chunk_bytes=100 * 1024 * 1024,
+        flush_interval=5.0,
+        concurrent_requests=1,
+        expand_action_callback=expand_action,
+        success_callback=None,
+        error_callback=None,
+        ignore_status=(),
+        spool_dir=None,
+        **kwargs,
+    ):
+        self.client = client.options()
+        self.client._client_meta = (("h", "bp"),)
+        self.chunk_size = chunk_size
+        self.max_chunk_bytes = max_chunk_bytes
+        self.flush_interval = flush_interval
+        self.expand_action_callback = expand_action_callback
+        self.success_callback = success_callback
+        self.error_callback = error_callback
+        self.ignore_status = ignore_status
+        self.kwargs = kwargs
+
+        self.serializer = self.client.transport.serializers.get_serializer(
+            "application/json"
+        )
+        self._chunker = _ActionChunker(chunk_size, max_chunk_bytes, self.serializer)
+        self._spool = _BulkSpool(spool_dir) if spool_dir is not None else None
+        # Chunks are put into the queue while holding the lock, so that
+        # no chunk can be added once close() has stopped the workers.
+        self._lock = threading.Lock()
+        self._chunks = Queue(concurrent_requests)
+        self._closed = threading.Event()
+
+        self._workers = [
+            threading.Thread(target=self._send_chunks, daemon=True)
+            for _ in range(concurrent_requests)
+        ]
+        self._threads = list(self._workers)
+        if flush_interval is not None:
+            self._threads.append(
+                threading.Thread(target=self._flush_periodically, daemon=True)
+            )
+        for thread in self._threads:
+            thread.start()
+
+        if self._spool is not None:
+            for segment, bulk_actions in self._spool.replay():
+                bulk_data, bulk_actions = _parse_bulk_body(
+                    bulk_actions, self.serializer
+                )
+                if bulk_data:
+                    self._chunks.put((bulk_data, bulk_actions, segment))
+                else:
+                    self._spool.remove(segment)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def add(self, action):
+        """
+        Add an action, blocks while ``concurrent_requests`` chunks are
+        waiting to be sent.
+        """
+        action, data = self.expand_action_callback(action)
+        # Serialize outside of the lock so threads can do it concurrently
+        encoded = to_bytes(self.serializer.dumps(action), "utf-8") + b"\n"
+        if data is not None:
+            encoded += to_bytes(self.serializer.dumps(data), "utf-8") + b"\n"
+            data = (action, data)
+        else:
+            data = (action,)
+
+        with self._lock:
+            if self._closed.is_set():
+                raise RuntimeError("Can't add actions to a closed BulkProcessor")
+            # send the chunk first if the action doesn't fit,
+            # the action has to be spooled into the next segment.
+            if self._chunker.is_full(len(encoded)):
+                self._flush()
+            if self._spool is not None:
+                self._spool.write(encoded)
+            self._chunker.feed_encoded(data, encoded)
+            # don't wait for the next action to send a full chunk
+            if self._chunker.is_full():
+                self._flush()
+
+    def flush(self):
+        """
+        Send the buffered actions and wait until all actions added so far
+        were sent and their results were reported.
+        """
+        with self._lock:
+            self._flush()
+        self._chunks.join()
+
+    def close(self):
+        """
+        Send the buffered actions, wait for all requests to finish and stop
+        the background threads. Actions can't be added afterwards.
+        """
+        with self._lock:
+            if self._closed.is_set():
+                return
+            self._closed.set()
+            self._flush()
+            for _ in self._workers:
+                self._chunks.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _flush(self):
+        chunk = self._chunker.flush()
+        if chunk:
+            segment = self._spool.seal() if self._spool is not None else None
+            self._chunks.put((*chunk, segment))
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            with self._lock:
+                if not self._closed.is_set():
+                    self._flush()
+
+    def _send_chunks(self):
+        while True:
+            chunk = self._chunks.get()
+            try:
+                if chunk is None:
+                    return
+                self._send_chunk(*chunk)
+            except Exception:
+                # keep the thread alive when a callback fails
+                logger.exception("Failed to report the results of a bulk request")
+            finally:
+                self._chunks.task_done()
+
+    def _send_chunk(self, bulk_data, bulk_actions, segment):
+        try:
+            results = list(
+                _streaming_bulk_chunks(
+                    self.client,
+                    ((bulk_data, bulk_actions),),
+                    self.serializer,
+                    self.chunk_size,
+                    self.max_chunk_bytes,
+                    raise_on_error=False,
+                    raise_on_exception=False,
+                    yield_ok=self.success_callback is not None,
+                    ignore_status=self.ignore_status,
+                    **self.kwargs,
+                )
+            )
+        except Exception as e:
+            # errors which aren't API errors, like connection errors,
+            # are raised even with raise_on_exception=False. The segment
+            # is kept so that the chunk is sent again after a restart.
+            results = [(False, info) for info in _failed_actions(e, bulk_data, None)]
+        else:
+            if segment is not None:
+                self._spool.remove(segment)
+
+        for ok, info in results:
+            if ok:
+                self.success_callback(info)
+            elif self.error_callback is not None:
+                self.error_callback(info)
+            else:
+                logger.warning("Bulk action failed: %r", info)
+
+
+def _prefetch(iterator, size):
+    """
+    Consume a generator in a background thread, keeping up to ``size`` of its
+    items ahead of the caller. Once the caller stops iterating the generator
+    is closed within the background thread as well.
+    """
+    items = Queue(size)
+    stopped = threading.Event()
+    done = object()
+
+    def produce():
+        try:
+            try:
+                for item in iterator:
+                    if stopped.is_set():
+                        break
+                    items.put((item, None))
+            finally:
+                iterator.close()
+        except Exception as e:
+            items.put((done, e))
+        else:
+            items.put((done, None))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if error is not None:
+                raise error
+            if item is done:
+                break
+            yield item
+
+    finally:
+        stopped.set()
+        # Keep taking items out of the queue so the
+        # background thread isn't stuck waiting for room.
+        while thread.is_alive():
+            try:
+                items.get(timeout=0.1)
+            except Empty:
+                pass
+
+
+def _pop_transport_kwargs(kw):
+    # Grab options that should be propagated to every
+    # API call within a scan helper instead of just 'search()'
+    transport_kwargs = {}
+    for key in ("headers", "api_key", "http_auth", "basic_auth", "bearer_auth"):
+        try:
+            value = kw.pop(key)
+            if key == "http_auth":
+                key = "basic_auth"
+            transport_kwargs[key] = value
+        except KeyError:
+            pass
+    return transport_kwargs
+
+
+def _check_shards(resp, search_id, raise_on_error, request_type):
+    # Default to 0 if the value isn't included in the response
+    shards_successful = resp.raw["_shards"].get("successful", 0)
+    shards_skipped = resp.raw["_shards"].get("skipped", 0)
+    shards_total = resp.raw["_shards"].get("total", 0)
+
+    # check if we have any errors
+    if (shards_successful + shards_skipped) < shards_total:
+        shards_message = (
+            request_type
+            + " request has only succeeded on %d (+%d skipped) shards out of %d."
+        )
+        logger.warning(
+            shards_message,
+            shards_successful,
+            shards_skipped,
+            shards_total,
+        )
+        if raise_on_error:
+            raise ScanError(
+                search_id,
+                shards_message
+                % (
+                    shards_successful,
+                    shards_skipped,
+                    shards_total,
+                ),
+            )
+
+
 def scan(
     client,
     query=None,
@@ -501,6 +1699,7 @@ def scan(
     request_timeout=None,
     clear_scroll=True,
     scroll_kwargs=None,
+    prefetch=0,
     **kwargs,
 ):
     """
@@ -531,6 +1730,9 @@ def scan(
         to true.
     :arg scroll_kwargs: additional kwargs to be passed to
         :meth:`~elasticsearch.Elasticsearch.scroll`
+    :arg prefetch: number of pages to fetch in a background thread ahead of
+        the hits being consumed, set to 0 (default) to only request the next
+        page once all hits of the current one were consumed.
 
     Any additional keyword arguments will be passed to the initial
     :meth:`~elasticsearch.Elasticsearch.search` call::
@@ -547,22 +1749,8 @@ def scan(
         query = query.copy() if query else {}
         query["sort"] = "_doc"
 
-    def pop_transport_kwargs(kw):
-        # Grab options that should be propagated to every
-        # API call within this helper instead of just 'search()'
-        transport_kwargs = {}
-        for key in ("headers", "api_key", "http_auth", "basic_auth", "bearer_auth"):
-            try:
-                value = kw.pop(key)
-                if key == "http_auth":
-                    key = "basic_auth"
-                transport_kwargs[key] = value
-            except KeyError:
-                pass
-        return transport_kwargs
-
     client = client.options(
-        request_timeout=request_timeout, **pop_transport_kwargs(kwargs)
+        request_timeout=request_timeout, **_pop_transport_kwargs(kwargs)
     )
     client._client_meta = (("h", "s"),)
 
@@ -580,49 +1768,263 @@ def scan(
         search_kwargs["size"] = size
         resp = client.search(body=query, **search_kwargs)
 
-    scroll_id = resp.raw.get("_scroll_id")
-    scroll_transport_kwargs = pop_transport_kwargs(scroll_kwargs)
+    scroll_transport_kwargs = _pop_transport_kwargs(scroll_kwargs)
     if scroll_transport_kwargs:
         scroll_client = client.options(**scroll_transport_kwargs)
     else:
         scroll_client = client
 
+    def scroll_pages(resp):
+        scroll_id = resp.raw.get("_scroll_id")
+        try:
+            while scroll_id and resp.raw["hits"]["hits"]:
+                yield resp
+                resp = scroll_client.scroll(
+                    scroll_id=scroll_id, scroll=scroll, **scroll_kwargs
+                )
+                scroll_id = resp.raw.get("_scroll_id")
+
+        finally:
+            if scroll_id and clear_scroll:
+                client.options(ignore_status=404).clear_scroll(scroll_id=scroll_id)
+
+    pages = scroll_pages(resp)
+    if prefetch:
+        pages = _prefetch(pages, prefetch)
+
     try:
-        while scroll_id and resp.raw["hits"]["hits"]:
+        for resp in pages:
             yield from resp.raw["hits"]["hits"]
 
-            # Default to 0 if the value isn't included in the response
-            shards_successful = resp.raw["_shards"].get("successful", 0)
-            shards_skipped = resp.raw["_shards"].get("skipped", 0)
-            shards_total = resp.raw["_shards"].get("total", 0)
+            _check_shards(resp, resp.raw["_scroll_id"], raise_on_error, "Scroll")
 
-            # check if we have any errors
-            if (shards_successful + shards_skipped) < shards_total:
-                shards_message = "Scroll request has only succeeded on %d (+%d skipped) shards out of %d."
-                logger.warning(
-                    shards_message,
-                    shards_successful,
-                    shards_skipped,
-                    shards_total,
+    finally:
+        pages.close()
+
+
+def pit_scan(
+    client,
+    index,
+    query=None,
+    keep_alive="5m",
+    raise_on_error=True,
+    preserve_order=False,
+    size=1000,
+    request_timeout=None,
+    close_point_in_time=True,
+    pit_kwargs=None,
+    prefetch=0,
+    **kwargs,
+):
+    """
+    Alternative to :func:`~elasticsearch.helpers.scan` which pages through
+    a `point in time
+    <https://www.elastic.co/guide/en/elasticsearch/reference/current/point-in-time-api.html>`_
+    with ``search_after`` instead of keeping a scroll context open - a simple
+    iterator that yields all hits of the index as they were when the point
+    in time was opened.
+
+    By default the hits are sorted by ``_shard_doc``, the cheapest order to
+    page through. To keep the sort of the query, use ``preserve_order=True``.
+
+    :arg client: instance of :class:`~elasticsearch.Elasticsearch` to use
+    :arg index: the index (or comma-separated list of indices) to open the
+        point in time on
+    :arg query: body for the :meth:`~elasticsearch.Elasticsearch.search` api
+    :arg keep_alive: Specify how long the point in time should be kept alive
+        between two searches
+    :arg raise_on_error: raises an exception (``ScanError``) if an error is
+        encountered (some shards fail to execute). By default we raise.
+    :arg preserve_order: don't replace the sort of the query with
+        ``_shard_doc``. Elasticsearch adds ``_shard_doc`` as tiebreaker to any
+        sort of searches against a point in time.
+    :arg size: number of hits to fetch with every search.
+    :arg request_timeout: explicit timeout for each call to ``pit_scan``
+    :arg close_point_in_time: explicitly closes the point in time at the end
+        of the method on completion or error, defaults to true.
+    :arg pit_kwargs: additional kwargs to be passed to
+        :meth:`~elasticsearch.Elasticsearch.open_point_in_time`
+    :arg prefetch: number of pages to fetch in a background thread ahead of
+        the hits being consumed, set to 0 (default) to only request the next
+        page once all hits of the current one were consumed.
+
+    Any additional keyword arguments will be passed to every
+    :meth:`~elasticsearch.Elasticsearch.search` call::
+
+        pit_scan(es,
+            "orders-*",
+            query={"query": {"match": {"title": "python"}}},
+            keep_alive="1m"
+        )
+
+    """
+    pit_kwargs = pit_kwargs or {}
+    query = query.copy() if query else {}
+    if not preserve_order:
+        query["sort"] = ["_shard_doc"]
+    # counting all hits isn't needed to page through them
+    query.setdefault("track_total_hits", False)
+    query["size"] = size
+
+    client = client.options(
+        request_timeout=request_timeout, **_pop_transport_kwargs(kwargs)
+    )
+    client._client_meta = (("h", "s"),)
+
+    def pit_pages():
+        resp = client.open_point_in_time(
+            index=index, keep_alive=keep_alive, **pit_kwargs
+        )
+        pit_id = resp.raw["id"]
+        try:
+            while True:
+                query["pit"] = {"id": pit_id, "keep_alive": keep_alive}
+                resp = client.search(body=query, **kwargs)
+                # the id of the point in time can change between searches
+                pit_id = resp.raw.get("pit_id", pit_id)
+
+                hits = resp.raw["hits"]["hits"]
+                if not hits:
+                    break
+                yield pit_id, resp
+
+                # a page that isn't full is the last one
+                if len(hits) < size:
+                    break
+                query["search_after"] = hits[-1]["sort"]
+
+        finally:
+            if pit_id and close_point_in_time:
+                client.options(ignore_status=404).close_point_in_time(
+                    body={"id": pit_id}
                 )
-                if raise_on_error:
-                    raise ScanError(
-                        scroll_id,
-                        shards_message
-                        % (
-                            shards_successful,
-                            shards_skipped,
-                            shards_total,
-                        ),
-                    )
-            resp = scroll_client.scroll(
-                scroll_id=scroll_id, scroll=scroll, **scroll_kwargs
-            )
-            scroll_id = resp.raw.get("_scroll_id")
+
+    pages = pit_pages()
+    if prefetch:
+        pages = _prefetch(pages, prefetch)
+
+    try:
+        for pit_id, resp in pages:
+            yield from resp.raw["hits"]["hits"]
+
+            _check_shards(resp, pit_id, raise_on_error, "Search")
 
     finally:
-        if scroll_id and clear_scroll:
-            client.options(ignore_status=404).clear_scroll(scroll_id=scroll_id)
+        pages.close()
+
+
+def parallel_scan(
+    client,
+    query=None,
+    slices=4,
+    workers=None,
+    queue_size=4,
+    scroll="5m",
+    raise_on_error=True,
+    size=1000,
+    request_timeout=None,
+    clear_scroll=True,
+    scroll_kwargs=None,
+    **kwargs,
+):
+    """
+    Parallel version of :func:`~elasticsearch.helpers.scan` which splits the
+    scroll into ``slices`` using a `sliced scroll
+    <https://www.elastic.co/guide/en/elasticsearch/reference/current/paginate-search-results.html#slice-scroll>`_
+    and scrolls through them in multiple threads at once. Hits of all slices
+    are yielded from a single iterator in no particular order.
+
+    When an error occurs in any of the slices, or the iterator isn't consumed
+    until the end, all slices are stopped and their scrolls are cleared.
+
+    :arg client: instance of :class:`~elasticsearch.Elasticsearch` to use
+    :arg query: body for the :meth:`~elasticsearch.Elasticsearch.search` api
+    :arg slices: number of slices to split the scroll into
+    :arg workers: number of threads scrolling through slices at the same time,
+        defaults to ``slices``
+    :arg queue_size: number of batches of ``size`` hits per worker that can
+        be fetched ahead of the hits being consumed
+    :arg scroll: Specify how long a consistent view of the index should be
+        maintained for scrolled search
+    :arg raise_on_error: raises an exception (``ScanError``) if an error is
+        encountered (some shards fail to execute). By default we raise.
+    :arg size: size (per shard) of the batch send at each iteration.
+    :arg request_timeout: explicit timeout for each call to ``scan``
+    :arg clear_scroll: explicitly calls delete on the scroll id via the clear
+        scroll API at the end of every slice on completion or error, defaults
+        to true.
+    :arg scroll_kwargs: additional kwargs to be passed to
+        :meth:`~elasticsearch.Elasticsearch.scroll`
+
+    Any additional keyword arguments will be passed to the initial
+    :meth:`~elasticsearch.Elasticsearch.search` call of every slice::
+
+        parallel_scan(es,
+            query={"query": {"match": {"title": "python"}}},
+            index="orders-*",
+            slices=8
+        )
+
+    """
+    # Avoid importing multiprocessing unless parallel_scan is used
+    # to avoid exceptions on restricted environments like App Engine
+    from multiprocessing.pool import ThreadPool
+
+    workers = workers or slices
+    # Batches of hits, or the id of a slice once it's done.
+    results = Queue(queue_size * workers)
+    stopped = threading.Event()
+
+    def scan_slice(slice_id):
+        slice_query = query.copy() if query else {}
+        slice_query["slice"] = {"id": slice_id, "max": slices}
+        hits = scan(
+            client,
+            query=slice_query,
+            scroll=scroll,
+            raise_on_error=raise_on_error,
+            size=size,
+            request_timeout=request_timeout,
+            clear_scroll=clear_scroll,
+            scroll_kwargs=dict(scroll_kwargs or {}),
+            **kwargs,
+        )
+        try:
+            while not stopped.is_set():
+                batch = list(islice(hits, size))
+                if not batch:
+                    break
+                results.put(batch)
+        finally:
+            # clears the scroll of the slice
+            hits.close()
+            results.put(slice_id)
+
+    pool = ThreadPool(workers)
+    tasks = []
+    try:
+        tasks.extend(pool.apply_async(scan_slice, (i,)) for i in range(slices))
+        remaining = slices
+        while remaining:
+            batch = results.get()
+            if isinstance(batch, int):
+                # raise the error of the slice if it failed
+                tasks[batch].get()
+                remaining -= 1
+            else:
+                yield from batch
+
+    finally:
+        stopped.set()
+        pool.close()
+        # Keep taking batches out of the queue until all slices are
+        # stopped so that none of them is stuck waiting for room.
+        while not all(task.ready() for task in tasks):
+            try:
+                results.get(timeout=0.1)
+            except Empty:
+                pass
+        pool.join()
 
 
 def reindex(
@@ -636,6 +2038,11 @@ def reindex(
     op_type=None,
     scan_kwargs={},
     bulk_kwargs={},
+    pipelined=False,
+    slices=None,
+    thread_count=1,
+    queue_size=4,
+    progress_callback=None,
 ):
 
     """
@@ -670,12 +2077,50 @@ def reindex(
         :func:`~elasticsearch.helpers.scan`
     :arg bulk_kwargs: additional kwargs to be passed to
         :func:`~elasticsearch.helpers.bulk`
+    :arg pipelined: read and write documents at the same time instead of
+        scanning the next page only once the previous chunk was indexed. Pages
+        are scanned in a background thread (or in ``slices``) while chunks are
+        being indexed (in ``thread_count`` threads).
+    :arg slices: when ``pipelined``, scan the source index in this many slices
+        at once using :func:`~elasticsearch.helpers.parallel_scan`
+    :arg thread_count: when ``pipelined``, index the documents in this many
+        threads at once using :func:`~elasticsearch.helpers.parallel_bulk`
+    :arg queue_size: when ``pipelined``, number of pages that can be scanned
+        ahead of the documents being indexed
+    :arg progress_callback: when ``pipelined``, called with a dict counting
+        the ``scanned``, ``indexed`` and ``failed`` documents after every
+        ``chunk_size`` results and once all documents were reindexed
     """
     target_client = client if target_client is None else target_client
-    docs = scan(client, query=query, index=source_index, scroll=scroll, **scan_kwargs)
+    if not pipelined:
+        docs = scan(
+            client, query=query, index=source_index, scroll=scroll, **scan_kwargs
+        )
+    elif slices:
+        docs = parallel_scan(
+            client,
+            query=query,
+            index=source_index,
+            slices=slices,
+            queue_size=queue_size,
+            scroll=scroll,
+            **scan_kwargs,
+        )
+    else:
+        docs = scan(
+            client,
+            query=query,
+            index=source_index,
+            scroll=scroll,
+            prefetch=queue_size,
+            **scan_kwargs,
+        )
+
+    progress = {"scanned": 0, "indexed": 0, "failed": 0}
 
     def _change_doc_index(hits, index, op_type):
         for h in hits:
+            progress["scanned"] += 1
             h["_index"] = index
             if op_type is not None:
                 h["_op_type"] = op_type
@@ -706,9 +2151,42 @@ def reindex(
         else:
             op_type = "create"
 
-    return bulk(
-        target_client,
-        _change_doc_index(docs, target_index, op_type),
-        chunk_size=chunk_size,
-        **kwargs,
-    )
+    actions = _change_doc_index(docs, target_index, op_type)
+    if not pipelined:
+        return bulk(target_client, actions, chunk_size=chunk_size, **kwargs)
+
+    stats_only = kwargs.pop("stats_only")
+    if thread_count > 1:
+        results = parallel_bulk(
+            target_client,
+            actions,
+            thread_count=thread_count,
+            chunk_size=chunk_size,
+            queue_size=queue_size,
+            **kwargs,
+        )
+    else:
+        kwargs["yield_ok"] = True
+        results = streaming_bulk(
+            target_client, actions, chunk_size=chunk_size, **kwargs
+        )
+
+    # list of errors to be collected is not stats_only
+    errors = []
+    for ok, item in results:
+        if ok:
+            progress["indexed"] += 1
+        else:
+            if not stats_only:
+                errors.append(item)
+            progress["failed"] += 1
+
+        if progress_callback is not None and not (
+            (progress["indexed"] + progress["failed"]) % chunk_size
+        ):
+            progress_callback(dict(progress))
+
+    if progress_callback is not None:
+        progress_callback(dict(progress))
+
+    return progress["indexed"], progress["failed"] if stats_only else errors
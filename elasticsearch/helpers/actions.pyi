@@ -52,7 +52,7 @@ def _process_bulk_chunk(
 def streaming_bulk(
     client: Elasticsearch,
     actions: Union[Iterable[Any], AsyncIterable[Any]],
-    chunk_size: int = ...,
+    chunk_size: Union[int, str] = ...,
     max_chunk_bytes: int = ...,
     raise_on_error: bool = ...,
     expand_action_callback: Callable[[Any], Tuple[Dict[str, Any], Optional[Any]]] = ...,
@@ -63,6 +63,11 @@ def streaming_bulk(
     yield_ok: bool = ...,
     ignore_status: Optional[Union[int, Collection[int]]] = ...,
     *args: Any,
+    min_chunk_size: int = ...,
+    max_chunk_size: int = ...,
+    target_latency: float = ...,
+    pipeline_depth: int = ...,
+    spool_dir: Optional[str] = ...,
     **kwargs: Any,
 ) -> Generator[Tuple[bool, Any], None, None]: ...
 def bulk(
@@ -73,16 +78,99 @@ def bulk(
     *args: Any,
     **kwargs: Any,
 ) -> Tuple[int, Union[int, List[Any]]]: ...
+def bulk_from_dataframe(
+    client: Elasticsearch,
+    dataframe: Any,
+    index: Optional[str] = ...,
+    op_type: str = ...,
+    id_column: Optional[str] = ...,
+    index_column: Optional[str] = ...,
+    routing_column: Optional[str] = ...,
+    batch_size: int = ...,
+    chunk_size: int = ...,
+    max_chunk_bytes: int = ...,
+    stats_only: bool = ...,
+    **kwargs: Any,
+) -> Tuple[int, Union[int, List[Any]]]: ...
+def bulk_from_arrow(
+    client: Elasticsearch,
+    table: Any,
+    index: Optional[str] = ...,
+    op_type: str = ...,
+    id_column: Optional[str] = ...,
+    index_column: Optional[str] = ...,
+    routing_column: Optional[str] = ...,
+    batch_size: int = ...,
+    chunk_size: int = ...,
+    max_chunk_bytes: int = ...,
+    stats_only: bool = ...,
+    **kwargs: Any,
+) -> Tuple[int, Union[int, List[Any]]]: ...
+
+class BulkProcessor:
+    client: Elasticsearch
+    chunk_size: int
+    max_chunk_bytes: int
+    flush_interval: Optional[float]
+    expand_action_callback: Callable[[Any], Tuple[Dict[str, Any], Optional[Any]]]
+    success_callback: Optional[Callable[[Any], None]]
+    error_callback: Optional[Callable[[Any], None]]
+    ignore_status: Optional[Union[int, Collection[int]]]
+    kwargs: Dict[str, Any]
+    serializer: Serializer
+    def __init__(
+        self,
+        client: Elasticsearch,
+        chunk_size: int = ...,
+        max_chunk_bytes: int = ...,
+        flush_interval: Optional[float] = ...,
+        concurrent_requests: int = ...,
+        expand_action_callback: Callable[
+            [Any], Tuple[Dict[str, Any], Optional[Any]]
+        ] = ...,
+        success_callback: Optional[Callable[[Any], None]] = ...,
+        error_callback: Optional[Callable[[Any], None]] = ...,
+        ignore_status: Optional[Union[int, Collection[int]]] = ...,
+        spool_dir: Optional[str] = ...,
+        **kwargs: Any,
+    ) -> None: ...
+    def __enter__(self) -> "BulkProcessor": ...
+    def __exit__(self, *_: Any) -> None: ...
+    def add(self, action: Any) -> None: ...
+    def flush(self) -> None: ...
+    def close(self) -> None: ...
+
 def parallel_bulk(
     client: Elasticsearch,
     actions: Iterable[Any],
     thread_count: int = ...,
-    chunk_size: int = ...,
+    chunk_size: Union[int, str] = ...,
     max_chunk_bytes: int = ...,
     queue_size: int = ...,
     expand_action_callback: Callable[[Any], Tuple[Dict[str, Any], Optional[Any]]] = ...,
     ignore_status: Optional[Union[int, Collection[int]]] = ...,
     *args: Any,
+    min_chunk_size: int = ...,
+    max_chunk_size: int = ...,
+    target_latency: float = ...,
+    raise_on_error: bool = ...,
+    raise_on_exception: bool = ...,
+    max_retries: int = ...,
+    initial_backoff: Union[float, int] = ...,
+    max_backoff: Union[float, int] = ...,
+    ordered: bool = ...,
+    **kwargs: Any,
+) -> Generator[Tuple[bool, Any], None, None]: ...
+def process_bulk(
+    client: Elasticsearch,
+    actions: Iterable[Any],
+    process_count: Optional[int] = ...,
+    pipeline_depth: int = ...,
+    chunk_size: int = ...,
+    max_chunk_bytes: int = ...,
+    queue_size: int = ...,
+    expand_action_callback: Callable[[Any], Tuple[Dict[str, Any], Optional[Any]]] = ...,
+    ignore_status: Optional[Union[int, Collection[int]]] = ...,
     **kwargs: Any,
 ) -> Generator[Tuple[bool, Any], None, None]: ...
 def scan(
@@ -95,6 +183,35 @@ def scan(
     request_timeout: Optional[Union[float, int]] = ...,
     clear_scroll: bool = ...,
     scroll_kwargs: Optional[Mapping[str, Any]] = ...,
+    prefetch: int = ...,
+    **kwargs: Any,
+) -> Generator[Any, None, None]: ...
+def pit_scan(
+    client: Elasticsearch,
+    index: Any,
+    query: Optional[Any] = ...,
+    keep_alive: str = ...,
+    raise_on_error: bool = ...,
+    preserve_order: bool = ...,
+    size: int = ...,
+    request_timeout: Optional[Union[float, int]] = ...,
+    close_point_in_time: bool = ...,
+    pit_kwargs: Optional[Mapping[str, Any]] = ...,
+    prefetch: int = ...,
+    **kwargs: Any,
+) -> Generator[Any, None, None]: ...
+def parallel_scan(
+    client: Elasticsearch,
+    query: Optional[Any] = ...,
+    slices: int = ...,
+    workers: Optional[int] = ...,
+    queue_size: int = ...,
+    scroll: str = ...,
+    raise_on_error: bool = ...,
+    size: int = ...,
+    request_timeout: Optional[Union[float, int]] = ...,
+    clear_scroll: bool = ...,
+    scroll_kwargs: Optional[Mapping[str, Any]] = ...,
     **kwargs: Any,
 ) -> Generator[Any, None, None]: ...
 def reindex(
@@ -108,4 +225,9 @@ def reindex(
     op_type: str = ...,
     scan_kwargs: Optional[Mapping[str, Any]] = ...,
     bulk_kwargs: Optional[Mapping[str, Any]] = ...,
+    pipelined: bool = ...,
+    slices: Optional[int] = ...,
+    thread_count: int = ...,
+    queue_size: int = ...,
+    progress_callback: Optional[Callable[[Dict[str, int]], Any]] = ...,
 ) -> Tuple[int, Union[int, List[Any]]]: ...
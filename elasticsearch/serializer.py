@@ -15,10 +15,24 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
+import json
+import re
 import uuid
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Any, ClassVar, Dict, Tuple
+from json.decoder import JSONDecodeError
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from elastic_transport import JsonSerializer as _JsonSerializer
 from elastic_transport import NdjsonSerializer as _NdjsonSerializer
@@ -28,6 +42,11 @@ from elastic_transport import TextSerializer as TextSerializer
 from .compat import to_bytes
 from .exceptions import SerializationError
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 INTEGER_TYPES = ()
 FLOAT_TYPES = (Decimal,)
 TIME_TYPES = (date, datetime)
@@ -39,6 +58,8 @@ __all__ = [
     "NdjsonSerializer",
     "CompatibilityModeSerializer",
     "MapboxVectorTileSerializer",
+    "LazyHitsJsonSerializer",
+    "LazyHits",
 ]
 
 
@@ -64,6 +85,10 @@ class JsonSerializer(_JsonSerializer):
         elif INTEGER_TYPES and isinstance(data, INTEGER_TYPES):
             return int(data)
 
+        # Only responses deserialized by LazyHitsJsonSerializer have these
+        elif isinstance(data, LazyHits):
+            return list(data)
+
         # Special cases for numpy and pandas types
         # These are expensive to import so we try them last.
         serialized, value = _attempt_serialize_numpy_or_pandas(data)
@@ -79,6 +104,14 @@ class NdjsonSerializer(JsonSerializer, _NdjsonSerializer):
     def default(self, data: Any) -> Any:
         return JsonSerializer.default(self, data)
 
+    def dumps(self, data: Any) -> bytes:
+        # Bodies which are already encoded and newline terminated
+        # (like the chunks built by the bulk helpers) are sent as-is
+        # instead of being copied into a new buffer.
+        if isinstance(data, bytes) and data.endswith(b"\n"):
+            return data
+        return _NdjsonSerializer.dumps(self, data)
+
 
 class CompatibilityModeSerializer(JsonSerializer):
     mimetype: ClassVar[str] = "application/vnd.elasticsearch+json"
@@ -115,12 +148,190 @@ class MapboxVectorTileSerializer(Serializer):
         raise SerializationError(f"Cannot serialize {data!r} into a MapBox vector tile")
 
 
+class LazyHits(Sequence[Any]):
+    """
+    The ``hits.hits`` of a response deserialized by
+    :class:`LazyHitsJsonSerializer`. Only the JSON text of the response
+    is kept, each hit is decoded every time it's accessed. The JSON text
+    of the whole response stays in memory as long as the hits are
+    referenced.
+    """
+
+    __slots__ = ("_doc", "_offsets")
+
+    def __init__(self, doc: str, offsets: List[int]) -> None:
+        self._doc = doc
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [
+                _json_decoder.raw_decode(self._doc, offset)[0]
+                for offset in self._offsets[index]
+            ]
+        return _json_decoder.raw_decode(self._doc, self._offsets[index])[0]
+
+    def __iter__(self) -> Iterator[Any]:
+        for offset in self._offsets:
+            yield _json_decoder.raw_decode(self._doc, offset)[0]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, LazyHits)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"<LazyHits: {len(self)} hits>"
+
+
+class LazyHitsJsonSerializer(JsonSerializer):
+    """
+    JSON serializer which doesn't decode the ``hits.hits`` of search and
+    scroll responses, and of every response of msearch, up front. They're
+    deserialized as :class:`LazyHits` instead, so iterating over the hits
+    of a large page only needs the memory for its JSON text and one hit
+    at a time, at the cost of decoding every hit twice: once to find
+    where it ends and once when it's accessed.
+
+    It's never used by default, neither by the client nor by the helpers,
+    it has to be passed in the ``serializers`` of the client.
+    """
+
+    def json_loads(self, data: bytes) -> Any:
+        doc = data.decode("utf-8") if isinstance(data, bytes) else data
+        idx = _skip_whitespace(doc, 0)
+        value, idx = _decode_value(doc, idx, _LAZY_HITS_PATHS)
+        if _skip_whitespace(doc, idx) != len(doc):
+            raise JSONDecodeError("Extra data", doc, idx)
+        return value
+
+
+# Keys of a response leading to the hits which are decoded lazily. A dict
+# is an object and a list an array of items with the same keys.
+_LAZY_HITS_PATHS: Dict[str, Any] = {"hits": {"hits": LazyHits}}
+_LAZY_HITS_PATHS["responses"] = [_LAZY_HITS_PATHS]
+
+_json_decoder = json.JSONDecoder()
+_WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+# 'scanstring' is missing from the type stubs of 'json.decoder'.
+_scanstring: Callable[[str, int], Tuple[str, int]] = getattr(json.decoder, "scanstring")
+
+
+def _skip_whitespace(doc: str, idx: int) -> int:
+    return _WHITESPACE_RE.match(doc, idx).end()  # type: ignore[union-attr]
+
+
+def _decode_value(doc: str, idx: int, path: Any) -> Tuple[Any, int]:
+    # Values which aren't on the path to the hits, or don't
+    # have the expected type, are decoded as usual.
+    if isinstance(path, dict) and doc.startswith("{", idx):
+        return _decode_object(doc, idx, path)
+    elif isinstance(path, list) and doc.startswith("[", idx):
+        return _decode_array(
+            doc, idx, lambda doc, idx: _decode_value(doc, idx, path[0])
+        )
+    elif path is LazyHits and doc.startswith("[", idx):
+        offsets, idx = _decode_array(doc, idx, _decode_hit_offset)
+        return LazyHits(doc, offsets), idx
+    return _json_decoder.raw_decode(doc, idx)
+
+
+def _decode_object(doc: str, idx: int, path: Dict[str, Any]) -> Tuple[Any, int]:
+    obj: Dict[str, Any] = {}
+    idx = _skip_whitespace(doc, idx + 1)
+    if doc.startswith("}", idx):
+        return obj, idx + 1
+    while True:
+        if not doc.startswith('"', idx):
+            raise JSONDecodeError(
+                "Expecting property name enclosed in double quotes", doc, idx
+            )
+        key, idx = _scanstring(doc, idx + 1)
+        idx = _skip_whitespace(doc, idx)
+        if not doc.startswith(":", idx):
+            raise JSONDecodeError("Expecting ':' delimiter", doc, idx)
+        idx = _skip_whitespace(doc, idx + 1)
+        obj[key], idx = _decode_value(doc, idx, path.get(key))
+        idx = _skip_whitespace(doc, idx)
+        if doc.startswith("}", idx):
+            return obj, idx + 1
+        elif not doc.startswith(",", idx):
+            raise JSONDecodeError("Expecting ',' delimiter", doc, idx)
+        idx = _skip_whitespace(doc, idx + 1)
+
+
+def _decode_array(
+    doc: str, idx: int, decode_item: Callable[[str, int], Tuple[Any, int]]
+) -> Tuple[List[Any], int]:
+    items: List[Any] = []
+    idx = _skip_whitespace(doc, idx + 1)
+    if doc.startswith("]", idx):
+        return items, idx + 1
+    while True:
+        item, idx = decode_item(doc, idx)
+        items.append(item)
+        idx = _skip_whitespace(doc, idx)
+        if doc.startswith("]", idx):
+            return items, idx + 1
+        elif not doc.startswith(",", idx):
+            raise JSONDecodeError("Expecting ',' delimiter", doc, idx)
+        idx = _skip_whitespace(doc, idx + 1)
+
+
+def _decode_hit_offset(doc: str, idx: int) -> Tuple[int, int]:
+    # The hit is decoded only to find where it ends
+    return idx, _json_decoder.raw_decode(doc, idx)[1]
+
+
+if orjson is not None:
+    __all__ += ["OrjsonSerializer", "OrjsonNdjsonSerializer"]
+
+    # Dates are passed to default() to be formatted the same as by
+    # JsonSerializer, non-str dict keys are converted like json does.
+    # numpy values go through default() as well, orjson's own numpy
+    # support formats dates and float32 values differently.
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    class OrjsonSerializer(JsonSerializer):
+        """
+        JSON serializer using the faster orjson library, used by default if
+        orjson is installed. Types are serialized like by JsonSerializer
+        except for NaN and infinity which are serialized as null, as
+        Elasticsearch rejects them anyway, instead of checking every
+        document for them.
+        """
+
+        def json_dumps(self, data: Any) -> bytes:
+            try:
+                return orjson.dumps(data, default=self.default, option=_ORJSON_OPTIONS)
+            except orjson.JSONEncodeError:
+                # orjson rejects some data json accepts, like integers
+                # beyond 64 bits and lone surrogates.
+                return JsonSerializer.json_dumps(self, data)
+
+        def json_loads(self, data: bytes) -> Any:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                # Also for NaN and infinity which only json accepts
+                return JsonSerializer.json_loads(self, data)
+
+    class OrjsonNdjsonSerializer(OrjsonSerializer, NdjsonSerializer):
+        pass
+
+
 DEFAULT_SERIALIZERS: Dict[str, Serializer] = {
     JsonSerializer.mimetype: JsonSerializer(),
     MapboxVectorTileSerializer.mimetype: MapboxVectorTileSerializer(),
     NdjsonSerializer.mimetype: NdjsonSerializer(),
     CompatibilityModeSerializer.mimetype: CompatibilityModeSerializer(),
 }
+if orjson is not None:
+    DEFAULT_SERIALIZERS[OrjsonSerializer.mimetype] = OrjsonSerializer()
+    DEFAULT_SERIALIZERS[OrjsonNdjsonSerializer.mimetype] = OrjsonNdjsonSerializer()
 
 # Alias for backwards compatibility
 JSONSerializer = JsonSerializer
@@ -147,13 +358,24 @@ def _attempt_serialize_numpy_or_pandas(data: Any) -> Tuple[bool, Any]:
     return False, None
 
 
-def _attempt_serialize_numpy(data: Any) -> Tuple[bool, Any]:
-    global _attempt_serialize_numpy
-    try:
-        import numpy as np
+# The numpy and pandas types are looked up on the first
+# attempt to serialize a value and reused for all later ones.
+_NUMPY_TYPES: Optional[Tuple[Any, Tuple[Any, ...], Tuple[Any, ...], Any, Any]] = None
+_PANDAS_TYPES: Optional[Tuple[Tuple[Any, ...], Any, Any, Any]] = None
+
 
-        if isinstance(
-            data,
+def _attempt_serialize_numpy(data: Any) -> Tuple[bool, Any]:
+    global _attempt_serialize_numpy, _NUMPY_TYPES
+    if _NUMPY_TYPES is None:
+        try:
+            import numpy as np
+        except ImportError:
+            # Since we failed to import 'numpy' we don't want to try again.
+            _attempt_serialize_numpy = _attempt_serialize_noop
+            return False, None
+
+        _NUMPY_TYPES = (
+            np.ndarray,
             (
                 np.int_,
                 np.intc,
@@ -166,48 +388,50 @@ def _attempt_serialize_numpy(data: Any) -> Tuple[bool, Any]:
                 np.uint32,
                 np.uint64,
             ),
-        ):
-            return True, int(data)
-        elif isinstance(
-            data,
-            (
-                np.float_,
-                np.float16,
-                np.float32,
-                np.float64,
-            ),
-        ):
-            return True, float(data)
-        elif isinstance(data, np.bool_):
-            return True, bool(data)
-        elif isinstance(data, np.datetime64):
-            return True, data.item().isoformat()
-        elif isinstance(data, np.ndarray):
-            return True, data.tolist()
-
-    except ImportError:
-        # Since we failed to import 'numpy' we don't want to try again.
-        _attempt_serialize_numpy = _attempt_serialize_noop
-
+            (np.float16, np.float32, np.float64),
+            np.bool_,
+            np.datetime64,
+        )
+
+    ndarray, integer_types, float_types, bool_, datetime64 = _NUMPY_TYPES
+    # Arrays (like dense vectors) come first, they're the most common
+    if isinstance(data, ndarray):
+        return True, data.tolist()
+    elif isinstance(data, integer_types):
+        return True, int(data)
+    elif isinstance(data, float_types):
+        return True, float(data)
+    elif isinstance(data, bool_):
+        return True, bool(data)
+    elif isinstance(data, datetime64):
+        return True, data.item().isoformat()
     return False, None
 
 
 def _attempt_serialize_pandas(data: Any) -> Tuple[bool, Any]:
-    global _attempt_serialize_pandas
-    try:
-        import pandas as pd
-
-        if isinstance(data, (pd.Series, pd.Categorical)):
-            return True, data.tolist()
-        elif isinstance(data, pd.Timestamp) and data is not getattr(pd, "NaT", None):
-            return True, data.isoformat()
-        elif data is getattr(pd, "NA", None):
-            return True, None
-
-    except ImportError:
-        # Since we failed to import 'pandas' we don't want to try again.
-        _attempt_serialize_pandas = _attempt_serialize_noop
-
+    global _attempt_serialize_pandas, _PANDAS_TYPES
+    if _PANDAS_TYPES is None:
+        try:
+            import pandas as pd
+        except ImportError:
+            # Since we failed to import 'pandas' we don't want to try again.
+            _attempt_serialize_pandas = _attempt_serialize_noop
+            return False, None
+
+        _PANDAS_TYPES = (
+            (pd.Series, pd.Categorical),
+            pd.Timestamp,
+            getattr(pd, "NaT", None),
+            getattr(pd, "NA", None),
+        )
+
+    list_types, timestamp, nat, na = _PANDAS_TYPES
+    if isinstance(data, list_types):
+        return True, data.tolist()
+    elif isinstance(data, timestamp) and data is not nat:
+        return True, data.isoformat()
+    elif data is na:
+        return True, None
     return False, None
 
 
@@ -0,0 +1,418 @@
+# -*- coding: utf-8 -*-
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import asyncio
+import json
+
+import mock
+import pytest
+from elastic_transport import ApiResponseMeta, ObjectApiResponse
+
+from elasticsearch import AsyncElasticsearch, helpers
+from elasticsearch._async.helpers import _measure_bulk_chunk, _prefetch
+from elasticsearch.exceptions import ApiError
+from elasticsearch.helpers.actions import _AdaptiveChunkSize
+
+pytestmark = pytest.mark.asyncio
+
+
+class AsyncBulkClient:
+    """
+    Client which rejects documents with the given values of "x" the first
+    time they're sent. Requests of chunks starting with a document in
+    ``gates`` wait until the gate's event is set.
+    """
+
+    transport = AsyncElasticsearch("http://localhost:9200").transport
+
+    def __init__(self, rejected=(), gates=()):
+        self.rejected = set(rejected)
+        self.gates = {x: asyncio.Event() for x in gates}
+        self.bodies = []
+
+    def options(self, **_):
+        return self
+
+    async def bulk(self, body, **_):
+        self.bodies.append(bytes(body))
+        xs = [json.loads(line)["x"] for line in body.splitlines()[1::2]]
+        if xs[0] in self.gates:
+            await self.gates[xs[0]].wait()
+        items = []
+        for x in xs:
+            status = 429 if x in self.rejected else 201
+            self.rejected.discard(x)
+            items.append({"index": {"status": status, "x": x}})
+        return ObjectApiResponse(meta=None, raw={"items": items})
+
+
+async def settle():
+    # lets every task run until it waits for something
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+def sent(client):
+    return [
+        [json.loads(line)["x"] for line in body.splitlines()[1::2]]
+        for body in client.bodies
+    ]
+
+
+class TestAsyncStreamingBulk:
+    async def consume(self, client, actions, **kwargs):
+        return [
+            info["index"]["x"]
+            async for _, info in helpers.async_streaming_bulk(
+                client, actions, chunk_size=2, **kwargs
+            )
+        ]
+
+    async def test_results_are_yielded_in_order(self):
+        client = AsyncBulkClient(gates={0})
+        results = asyncio.ensure_future(
+            self.consume(client, [{"x": i} for i in range(6)], max_concurrency=3)
+        )
+        await settle()
+        assert [[0, 1], [2, 3], [4, 5]] == sent(client)
+        assert not results.done()
+
+        client.gates[0].set()
+        assert [0, 1, 2, 3, 4, 5] == await results
+
+    async def test_unordered_results_are_yielded_once_chunks_complete(self):
+        client = AsyncBulkClient(gates={0})
+        results = asyncio.ensure_future(
+            self.consume(
+                client,
+                [{"x": i} for i in range(6)],
+                max_concurrency=2,
+                ordered=False,
+            )
+        )
+        await settle()
+        # the fast chunks complete while the first one is in-flight
+        assert [[0, 1], [2, 3], [4, 5]] == sent(client)
+
+        client.gates[0].set()
+        assert [2, 3, 4, 5, 0, 1] == await results
+
+    async def test_chunks_waiting_for_a_slow_chunk_are_bounded(self):
+        client = AsyncBulkClient(gates={0})
+        results = asyncio.ensure_future(
+            self.consume(client, [{"x": i} for i in range(10)], max_concurrency=2)
+        )
+        await settle()
+        # the second chunk completed but its results wait for the first
+        assert [[0, 1], [2, 3]] == sent(client)
+
+        client.gates[0].set()
+        assert list(range(10)) == await results
+        assert 5 == len(client.bodies)
+
+    @pytest.mark.parametrize("ordered", [True, False])
+    async def test_rejected_documents_are_retried_within_their_chunk(self, ordered):
+        client = AsyncBulkClient(rejected={1, 4}, gates={2})
+        results = asyncio.ensure_future(
+            self.consume(
+                client,
+                [{"x": i} for i in range(6)],
+                max_concurrency=3,
+                ordered=ordered,
+                raise_on_error=False,
+                max_retries=1,
+                initial_backoff=0,
+            )
+        )
+        await settle()
+        assert [[0, 1], [2, 3], [4, 5], [1], [4]] == sent(client)
+
+        client.gates[2].set()
+        if ordered:
+            assert [0, 1, 2, 3, 5, 4] == await results
+        else:
+            assert [0, 1, 5, 4, 2, 3] == await results
+
+    async def test_spooled_chunks_are_removed_once_every_action_has_a_result(
+        self, tmp_path
+    ):
+        client = AsyncBulkClient(rejected={1})
+        spooled = []
+        async for _, info in helpers.async_streaming_bulk(
+            client,
+            [{"x": i} for i in range(4)],
+            chunk_size=2,
+            raise_on_error=False,
+            max_retries=1,
+            initial_backoff=0,
+            spool_dir=str(tmp_path),
+        ):
+            segments = sorted(path.name for path in tmp_path.iterdir())
+            spooled.append((info["index"]["x"], segments))
+
+        assert [
+            (0, ["00000000000000000001.ndjson"]),
+            (1, ["00000000000000000001.ndjson"]),
+            (2, ["00000000000000000002.ndjson"]),
+            (3, ["00000000000000000002.ndjson"]),
+        ] == spooled
+        assert [[0, 1], [1], [2, 3]] == sent(client)
+        assert [] == list(tmp_path.iterdir())
+
+    async def test_spooled_chunks_are_replayed(self, tmp_path):
+        # Segment left behind by a process which died while writing
+        (tmp_path / "00000000000000000001.ndjson").write_bytes(
+            b'{"index":{}}\n{"x":1}\n{"index":{}}\n{"x"'
+        )
+
+        client = AsyncBulkClient()
+        with mock.patch.object(
+            client, "bulk", side_effect=ConnectionError("connection refused")
+        ):
+            with pytest.raises(ConnectionError):
+                await self.consume(client, [{"x": 2}], spool_dir=str(tmp_path))
+        # Segments are kept when the request failed
+        assert 1 == len(list(tmp_path.iterdir()))
+
+        assert [1, 3] == await self.consume(client, [{"x": 3}], spool_dir=str(tmp_path))
+        assert [[1], [3]] == sent(client)
+        assert [] == list(tmp_path.iterdir())
+
+    async def test_chunk_size_follows_latency_and_rejections(self):
+        # the documents of the second chunk are rejected
+        client = AsyncBulkClient(rejected=range(500, 1050))
+        results = [
+            ok
+            async for ok, _ in helpers.async_streaming_bulk(
+                client,
+                [{"x": i} for i in range(2000)],
+                chunk_size="auto",
+                raise_on_error=False,
+            )
+        ]
+
+        assert 2000 == len(results)
+        assert 550 == results.count(False)
+        assert [500, 550, 275, 325, 350] == [len(xs) for xs in sent(client)][:5]
+
+    async def test_chunk_size_is_halved_on_rejected_requests(self):
+        async def rejected_request():
+            raise ApiError(
+                message="Rejected!",
+                body={},
+                meta=ApiResponseMeta(
+                    status=429, headers={}, http_version="1.1", duration=0, node=None
+                ),
+            )
+            yield
+
+        chunk_sizer = _AdaptiveChunkSize(chunk_size=500)
+        with pytest.raises(ApiError):
+            await _measure_bulk_chunk(chunk_sizer, [{}] * 500, rejected_request())
+        assert 250 == chunk_sizer.chunk_size
+
+
+class TestAsyncBulkProcessor:
+    async def test_full_chunks_are_sent_and_aclose_flushes_the_rest(self):
+        client = AsyncBulkClient()
+        results = []
+        async with helpers.AsyncBulkProcessor(
+            client, chunk_size=2, success_callback=results.append
+        ) as processor:
+            for i in range(5):
+                await processor.add({"x": i})
+            await processor.flush()
+            assert [[0, 1], [2, 3], [4]] == sent(client)
+
+            await processor.add({"x": 5})
+
+        assert [[0, 1], [2, 3], [4], [5]] == sent(client)
+        assert list(range(6)) == [info["index"]["x"] for info in results]
+        assert processor._flusher.done()
+
+        with pytest.raises(RuntimeError):
+            await processor.add({"x": 6})
+
+    async def test_aclose_without_actions(self):
+        client = AsyncBulkClient()
+        processor = helpers.AsyncBulkProcessor(client)
+        await processor.aclose()
+        await processor.aclose()
+
+        assert [] == client.bodies
+        with pytest.raises(RuntimeError):
+            await processor.add({"x": 1})
+
+    async def test_aclose_waits_for_in_flight_chunks(self):
+        client = AsyncBulkClient(gates={0})
+        results = []
+        processor = helpers.AsyncBulkProcessor(
+            client, chunk_size=2, success_callback=results.append
+        )
+        for i in range(3):
+            await processor.add({"x": i})
+
+        closing = asyncio.ensure_future(processor.aclose())
+        await settle()
+        # the last action waits until the first chunk completed
+        assert [[0, 1]] == sent(client)
+        assert not closing.done()
+
+        client.gates[0].set()
+        await closing
+        assert [[0, 1], [2]] == sent(client)
+        assert [0, 1, 2] == [info["index"]["x"] for info in results]
+
+    async def test_add_waits_for_concurrent_requests(self):
+        client = AsyncBulkClient(gates={0, 1})
+        processor = helpers.AsyncBulkProcessor(
+            client, chunk_size=1, concurrent_requests=2, flush_interval=None
+        )
+        await processor.add({"x": 0})
+        await processor.add({"x": 1})
+        adding = asyncio.ensure_future(processor.add({"x": 2}))
+        await settle()
+        assert [[0], [1]] == sent(client)
+        assert not adding.done()
+
+        client.gates[0].set()
+        await adding
+        client.gates[1].set()
+        await processor.aclose()
+        assert [[0], [1], [2]] == sent(client)
+
+    async def test_buffered_actions_are_sent_after_flush_interval(self):
+        client = AsyncBulkClient()
+        processor = helpers.AsyncBulkProcessor(client, flush_interval=0.01)
+        await processor.add({"x": 1})
+        for _ in range(100):
+            if client.bodies:
+                break
+            await asyncio.sleep(0.01)
+        assert [[1]] == sent(client)
+
+        await processor.aclose()
+        assert 1 == len(client.bodies)
+
+    async def test_errors_are_reported(self):
+        client = AsyncBulkClient(rejected={1})
+        errors = []
+        async with helpers.AsyncBulkProcessor(
+            client, error_callback=errors.append
+        ) as processor:
+            await processor.add({"_id": 0, "x": 0})
+            await processor.add({"_id": 1, "x": 1})
+        assert [{"index": {"status": 429, "x": 1}}] == errors
+
+        errors = []
+        with mock.patch.object(
+            client, "bulk", side_effect=ConnectionError("connection refused")
+        ):
+            async with helpers.AsyncBulkProcessor(
+                client, error_callback=errors.append
+            ) as processor:
+                await processor.add({"_id": 2, "x": 2})
+        assert 1 == len(errors)
+        assert "2" == str(errors[0]["index"]["_id"])
+        assert errors[0]["index"]["status"] is None
+
+
+class TestPrefetch:
+    async def test_items_are_fetched_ahead(self):
+        fetched = []
+
+        async def items():
+            for i in range(5):
+                fetched.append(i)
+                yield i
+
+        prefetched = _prefetch(items(), 2)
+        assert 0 == await prefetched.__anext__()
+        await settle()
+        # one item is waiting to be put into the full queue
+        assert [0, 1, 2, 3] == fetched
+
+        assert [1, 2, 3, 4] == [item async for item in prefetched]
+
+    async def test_errors_are_raised_in_order(self):
+        async def items():
+            yield 1
+            raise ValueError("failed")
+
+        prefetched = _prefetch(items(), 2)
+        assert 1 == await prefetched.__anext__()
+        with pytest.raises(ValueError):
+            await prefetched.__anext__()
+
+    async def test_generator_is_closed_when_stopped_early(self):
+        closed = asyncio.Event()
+
+        async def items():
+            try:
+                for i in range(100):
+                    yield i
+            finally:
+                closed.set()
+
+        prefetched = _prefetch(items(), 2)
+        assert 0 == await prefetched.__anext__()
+        await prefetched.aclose()
+        assert closed.is_set()
+
+    async def test_scan_prefetches_pages(self):
+        def response(hits):
+            return ObjectApiResponse(
+                meta=None,
+                raw={
+                    "_scroll_id": "scroll",
+                    "_shards": {"successful": 5, "total": 5},
+                    "hits": {"hits": hits},
+                },
+            )
+
+        pages = [[{"_id": str(i)}] for i in range(1, 4)] + [[]]
+        scroll_calls, clear_scroll_calls = [], []
+
+        async def search(*_, **__):
+            return response([{"_id": "0"}])
+
+        async def scroll(*_, **kwargs):
+            scroll_calls.append(kwargs)
+            return response(pages[len(scroll_calls) - 1])
+
+        async def clear_scroll(*_, **kwargs):
+            clear_scroll_calls.append(kwargs)
+
+        with mock.patch.object(
+            AsyncElasticsearch, "search", new=search
+        ), mock.patch.object(
+            AsyncElasticsearch, "scroll", new=scroll
+        ), mock.patch.object(
+            AsyncElasticsearch, "clear_scroll", new=clear_scroll
+        ):
+            hits = []
+            async for hit in helpers.async_scan(
+                AsyncElasticsearch("http://localhost:9200"), prefetch=2
+            ):
+                hits.append(hit["_id"])
+                if len(hits) == 1:
+                    await settle()
+                    assert 3 == len(scroll_calls)
+
+        assert ["0", "1", "2", "3"] == hits
+        assert [{"scroll_id": "scroll"}] == clear_scroll_calls
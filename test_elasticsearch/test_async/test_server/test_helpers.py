@@ -121,6 +121,30 @@ class TestStreamingBulk(object):
             "_source"
         ]
 
+    @pytest.mark.parametrize("ordered", [True, False])
+    async def test_concurrent_chunks_get_inserted(self, async_client, ordered):
+        docs = [{"answer": x, "_id": x} for x in range(100)]
+        results = [
+            item
+            async for ok, item in helpers.async_streaming_bulk(
+                async_client,
+                docs,
+                index="test-index",
+                refresh=True,
+                chunk_size=10,
+                max_concurrency=4,
+                ordered=ordered,
+            )
+            if ok
+        ]
+
+        assert 100 == len(results)
+        if ordered:
+            assert [str(x) for x in range(100)] == [
+                item["index"]["_id"] for item in results
+            ]
+        assert 100 == (await async_client.count(index="test-index"))["count"]
+
     async def test_all_errors_from_chunk_are_raised_on_failure(self, async_client):
         await async_client.indices.create(
             "i",
@@ -425,6 +449,72 @@ class TestBulk(object):
         assert 1 == failed
 
 
+class TestAsyncBulkProcessor(object):
+    async def test_all_documents_get_inserted(self, async_client):
+        results = []
+        async with helpers.AsyncBulkProcessor(
+            async_client,
+            chunk_size=10,
+            concurrent_requests=3,
+            success_callback=results.append,
+            index="test-index",
+            refresh=True,
+        ) as processor:
+            for x in range(100):
+                await processor.add({"answer": x, "_id": x})
+
+        assert 100 == len(results)
+        assert 100 == (await async_client.count(index="test-index"))["count"]
+        assert {"answer": 42} == (await async_client.get(index="test-index", id=42))[
+            "_source"
+        ]
+
+    async def test_buffered_documents_are_sent_after_flush_interval(self, async_client):
+        processor = helpers.AsyncBulkProcessor(
+            async_client, flush_interval=0.1, index="test-index", refresh=True
+        )
+        await processor.add({"answer": 42, "_id": 1})
+        for _ in range(50):
+            await asyncio.sleep(0.1)
+            if await async_client.exists(index="test-index", id=1):
+                break
+        else:
+            pytest.fail("Document wasn't sent")
+        await processor.aclose()
+
+        with pytest.raises(RuntimeError):
+            await processor.add({"answer": 43})
+
+    async def test_errors_are_reported(self, async_client):
+        await async_client.indices.create(
+            "i",
+            {
+                "mappings": {"properties": {"a": {"type": "integer"}}},
+                "settings": {"number_of_shards": 1, "number_of_replicas": 0},
+            },
+        )
+        await async_client.cluster.health(wait_for_status="yellow")
+
+        errors = []
+        async with helpers.AsyncBulkProcessor(
+            async_client, error_callback=errors.append, index="i"
+        ) as processor:
+            await processor.add({"a": 42})
+            await processor.add({"a": "c", "_id": 42})
+        assert 1 == len(errors)
+        assert "42" == errors[0]["index"]["_id"]
+
+        # exceptions are reported for every action of the chunk
+        async with helpers.AsyncBulkProcessor(
+            FailingBulkClient(async_client, fail_at=(1,)),
+            error_callback=errors.append,
+            index="i",
+        ) as processor:
+            await processor.add({"a": 1})
+            await processor.add({"a": 2})
+        assert [599, 599] == [error["index"]["status"] for error in errors[1:]]
+
+
 class MockScroll:
     def __init__(self):
         self.calls = []
@@ -608,6 +698,39 @@ class TestScan(object):
                         assert data == [{"search_data": 1}]
                         assert mock_scroll.calls == []
 
+    async def test_pages_are_prefetched(self, async_client, scan_teardown):
+        with patch.object(
+            async_client, "options", return_value=async_client
+        ), patch.object(
+            async_client, "clear_scroll", new_callable=AsyncMock
+        ) as clear_mock, patch.object(
+            async_client,
+            "search",
+            MockResponse(
+                ObjectApiResponse(
+                    raw={
+                        "_scroll_id": "dummy_id",
+                        "_shards": {"successful": 5, "total": 5, "skipped": 0},
+                        "hits": {"hits": [{"search_data": 1}]},
+                    },
+                    meta=None,
+                )
+            ),
+        ), patch.object(
+            async_client, "scroll", MockScroll()
+        ) as mock_scroll:
+            data = []
+            async for x in helpers.async_scan(
+                async_client, index="test_index", raise_on_error=False, prefetch=2
+            ):
+                data.append(x)
+                # both scroll requests are sent before the first hit is consumed
+                await asyncio.sleep(0.01)
+                assert 2 == len(mock_scroll.calls)
+
+            assert data == [{"search_data": 1}, {"scroll_data": 42}]
+            clear_mock.assert_called_once_with(scroll_id="dummy_id")
+
     async def test_no_scroll_id_fast_route(self, async_client, scan_teardown):
         with patch.object(
             async_client, "options", return_value=async_client
@@ -16,6 +16,9 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
+import subprocess
+import sys
+
 import pytest
 from elastic_transport.client_utils import DEFAULT
 
@@ -121,6 +124,175 @@ class TestOptions(DummyTransportTestCase):
             "Can't set 'Authorization' HTTP header with other authentication options",
         )
 
+    def test_options_client_shares_state(self):
+        client = Elasticsearch(
+            "http://localhost:9200",
+            transport_class=DummyTransport,
+            headers={"custom": "key"},
+        )
+        options_client = client.options(request_timeout=1)
+
+        assert options_client.transport is client.transport
+        assert options_client._headers is client._headers
+        # Namespaced clients are created once they're used
+        assert "indices" not in options_client.__dict__
+        assert options_client.indices is options_client.indices
+        assert options_client.indices._client is options_client
+        assert client.indices._client is client
+
+        options_client.indices.get(index="test")
+        call = client.transport.calls[("GET", "/test")][0]
+        assert call["request_timeout"] == 1
+        assert call["headers"]["custom"] == "key"
+
+        # Headers of the original client are left untouched
+        client.options(opaque_id="opaque").indices.get(index="test")
+        assert "x-opaque-id" not in client._headers
+        call = client.transport.calls[("GET", "/test")][1]
+        assert call["headers"]["x-opaque-id"] == "opaque"
+
+    @pytest.mark.parametrize(
+        ["client_cls", "transport_cls"],
+        [(Elasticsearch, DummyTransport), (AsyncElasticsearch, DummyAsyncTransport)],
+    )
+    def test_options_client_of_subclass(self, client_cls, transport_cls):
+        class CustomClient(client_cls):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.custom = {"key": "value"}
+
+        client = CustomClient(
+            "http://localhost:9200", transport_class=transport_cls, request_timeout=3
+        )
+        indices = client.indices
+        options_client = client.options(max_retries=1)
+
+        assert type(options_client) is CustomClient
+        assert options_client.custom is client.custom
+        assert options_client.transport is client.transport
+        assert options_client._max_retries == 1
+        assert client._max_retries is DEFAULT
+        # Per-request options aren't inherited, like for a client
+        # created with the transport of this client.
+        assert client._request_timeout == 3
+        assert options_client._request_timeout is DEFAULT
+        # Namespaced clients are bound to the client they're accessed on
+        assert options_client.indices is not indices
+        assert options_client.indices._client is options_client
+        assert client.indices is indices
+
+    @pytest.mark.parametrize(
+        ["client_cls", "transport_cls"],
+        [(Elasticsearch, DummyTransport), (AsyncElasticsearch, DummyAsyncTransport)],
+    )
+    def test_namespaced_clients_are_lazy(self, client_cls, transport_cls):
+        client = client_cls("http://localhost:9200", transport_class=transport_cls)
+        assert "indices" not in client.__dict__
+        assert "cat" not in client.__dict__
+
+        indices = client.indices
+        assert client.__dict__["indices"] is indices
+        assert client.indices is indices
+        assert indices._client is client
+        assert "cat" not in client.__dict__
+
+        # Each client gets its own namespaced clients
+        other = client_cls("http://localhost:9200", transport_class=transport_cls)
+        assert other.indices is not indices
+        assert other.indices._client is other
+
+    def test_merged_request_headers_are_cached(self):
+        client = Elasticsearch(
+            "http://localhost:9200",
+            transport_class=DummyTransport,
+            headers={"custom": "key"},
+        )
+        client.bulk(body=[{}])
+        client.options(request_timeout=1).bulk(body=[{}])
+        client.msearch(body=[{}])
+        client.bulk(body=[{}], headers={"other": "value"})
+
+        first, second, third = client.transport.calls[("POST", "/_bulk")]
+        # The same headers are shared by the requests and can't be changed
+        assert first["headers"] is second["headers"]
+        assert first["headers"].frozen
+        assert first["headers"] == {
+            "content-type": "application/x-ndjson",
+            "custom": "key",
+        }
+        assert third["headers"] == {
+            "content-type": "application/x-ndjson",
+            "custom": "key",
+            "other": "value",
+        }
+        # Other ndjson APIs share them too
+        msearch = client.transport.calls[("POST", "/_msearch")][0]
+        assert msearch["headers"] is first["headers"]
+        assert client._headers == {
+            "content-type": "application/json",
+            "custom": "key",
+        }
+
+        # Clients with different headers don't share merged headers
+        client.options(opaque_id="opaque").bulk(body=[{}])
+        assert client.transport.calls[("POST", "/_bulk")][-1]["headers"] == {
+            "content-type": "application/x-ndjson",
+            "custom": "key",
+            "x-opaque-id": "opaque",
+        }
+
+    def test_merged_request_headers_of_derived_clients_are_isolated(self):
+        client = Elasticsearch("http://localhost:9200", transport_class=DummyTransport)
+        client.bulk(body=[{}])
+        first = client.options(headers={"custom": "first"})
+        second = client.options(headers={"custom": "second"})
+        first.bulk(body=[{}])
+        second.bulk(body=[{}])
+        # Changing the headers of a derived client again leaves it untouched
+        first.options(headers={"custom": "third"}).bulk(body=[{}])
+        first.bulk(body=[{}])
+        client.bulk(body=[{}])
+
+        calls = client.transport.calls[("POST", "/_bulk")]
+        assert [call["headers"].get("custom") for call in calls] == [
+            None,
+            "first",
+            "second",
+            "third",
+            "first",
+            None,
+        ]
+        assert calls[1]["headers"] is calls[4]["headers"]
+        assert calls[0]["headers"] is calls[5]["headers"]
+        assert first._merged_headers is not second._merged_headers
+        assert first._merged_headers is not client._merged_headers
+        assert first._headers == {"content-type": "application/json", "custom": "first"}
+        assert "custom" not in client._headers
+
+        # Shared merged headers can't be changed through any client
+        with pytest.raises(ValueError):
+            calls[1]["headers"]["custom"] = "changed"
+
+    def test_namespaced_client_modules_are_imported_lazily(self):
+        code = """if True:
+            import sys
+            import elasticsearch
+
+            assert "elasticsearch._async.client" not in sys.modules
+            assert "elasticsearch._sync.client.indices" not in sys.modules
+
+            client = elasticsearch.Elasticsearch("http://localhost:9200")
+            client.indices
+            assert "elasticsearch._sync.client.indices" in sys.modules
+            assert "elasticsearch._sync.client.ml" not in sys.modules
+
+            from elasticsearch import AsyncElasticsearch
+
+            assert AsyncElasticsearch.__module__ == "elasticsearch"
+            assert "elasticsearch._async.client.indices" not in sys.modules
+        """
+        subprocess.run([sys.executable, "-c", code], check=True)
+
     def test_options_passed_to_perform_request(self):
         # Default transport options are 'DEFAULT' to rely on 'elastic_transport' defaults.
         client = Elasticsearch(
@@ -48,6 +48,26 @@ class TestQueryParams:
             )
         ]
 
+    def test_passes_other_kwargs_without_params(self):
+        self.func_to_wrap(1, index="test")
+        self.func_to_wrap(index="test")
+        assert self.calls == [
+            ((1,), {"index": "test", "params": {}, "headers": {}}),
+            ((), {"index": "test", "params": {}, "headers": {}}),
+        ]
+        # Every call gets its own params and headers
+        assert self.calls[0][1]["params"] is not self.calls[1][1]["params"]
+        assert self.calls[0][1]["headers"] is not self.calls[1][1]["headers"]
+
+    def test_params_are_ordered_as_declared(self):
+        @query_params("b", "a")
+        def func(**kwargs):
+            return kwargs["params"]
+
+        params = func(pretty=True, a=1, human=None, b="x", ignore=404)
+        assert list(params) == ["b", "a", "pretty", "ignore"]
+        assert params == {"b": b"x", "a": b"1", "pretty": b"true", "ignore": 404}
+
     def test_handles_headers(self):
         self.func_to_wrap(headers={"X-Opaque-Id": "app-1"})
         assert self.calls == [((), {"params": {}, "headers": {"x-opaque-id": "app-1"}})]
@@ -122,6 +142,13 @@ class TestMakePath:
             "some-index", "type", id
         )
 
+    def test_escapes_and_skips_parts(self):
+        for _ in range(2):  # Quoted string parts are cached
+            assert "/a%20b/_doc/x%2Fy" == _make_path("a b", None, "_doc", "x/y")
+        assert "/i1,i2/_doc/1" == _make_path(["i1", "i2"], "", "_doc", 1)
+        assert "/i*/_doc/true" == _make_path(("i*",), "_doc", True)
+        assert "/%E4%B8%AD" == _make_path("中".encode("utf-8"), [], ())
+
 
 class TestEscape:
     def test_handles_ascii(self):
@@ -16,11 +16,18 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
+import json
 import threading
 import time
 
 import mock
 import pytest
+from elastic_transport import ObjectApiResponse
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
 
 from elasticsearch import Elasticsearch, helpers
 from elasticsearch.helpers import actions
@@ -79,6 +86,952 @@ class TestParallelBulk:
         )
         assert len(set([r[1] for r in results])) > 1
 
+    def test_rejected_documents_are_retried(self):
+        rejected = set()
+
+        def process_bulk_chunk(client, bulk_actions, bulk_data, *args, **kwargs):
+            results = []
+            for _, data in bulk_data:
+                # every odd document is rejected on its first attempt
+                if data["x"] % 2 and data["x"] not in rejected:
+                    rejected.add(data["x"])
+                    info = {"x": data["x"], "status": 429}
+                    results.append((False, {"index": info}))
+                else:
+                    results.append((True, {"index": {"x": data["x"]}}))
+            return results
+
+        with mock.patch(
+            "elasticsearch.helpers.actions._process_bulk_chunk",
+            side_effect=process_bulk_chunk,
+        ):
+            results = list(
+                helpers.parallel_bulk(
+                    Elasticsearch("http://localhost:9200"),
+                    ({"x": i} for i in range(40)),
+                    chunk_size=10,
+                    max_retries=1,
+                    initial_backoff=0,
+                )
+            )
+
+        assert [(True, {"index": {"x": x}}) for x in range(40)] == sorted(
+            results, key=lambda result: result[1]["index"]["x"]
+        )
+        assert 20 == len(rejected)
+
+    def test_positional_arguments_are_passed_to_bulk(self):
+        calls = []
+
+        def process_bulk_chunk(client, bulk_actions, bulk_data, *args, **kwargs):
+            calls.append(args)
+            return [(True, {"index": {}}) for _ in bulk_data]
+
+        with mock.patch(
+            "elasticsearch.helpers.actions._process_bulk_chunk",
+            side_effect=process_bulk_chunk,
+        ):
+            list(
+                helpers.parallel_bulk(
+                    Elasticsearch("http://localhost:9200"),
+                    [{"x": 1}],
+                    1,
+                    500,
+                    1024,
+                    4,
+                    helpers.expand_action,
+                    (),
+                    "positional",
+                )
+            )
+
+        # after raise_on_exception, raise_on_error and ignore_status
+        assert [(True, True, (), "positional")] == calls
+
+    def test_unordered_results_are_yielded_as_chunks_complete(self):
+        def process_bulk_chunk(client, bulk_actions, bulk_data, *args, **kwargs):
+            # the first chunk is much slower than the others
+            if bulk_data[0][1]["x"] == 0:
+                time.sleep(0.2)
+            return [(True, {"index": {"x": data[1]["x"]}}) for data in bulk_data]
+
+        for ordered in (True, False):
+            with mock.patch(
+                "elasticsearch.helpers.actions._process_bulk_chunk",
+                side_effect=process_bulk_chunk,
+            ):
+                results = list(
+                    helpers.parallel_bulk(
+                        Elasticsearch("http://localhost:9200"),
+                        ({"x": i} for i in range(40)),
+                        chunk_size=10,
+                        ordered=ordered,
+                    )
+                )
+
+            assert 40 == len(results)
+            first = results[0][1]["index"]["x"]
+            assert first == 0 if ordered else first >= 10
+
+
+class FakeClock:
+    """
+    Replaces the time module of the bulk helpers, time only passes when
+    a request is sent or the helpers sleep.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class RejectingBulkClient:
+    """
+    Client which rejects documents with the given values of "x" the first
+    time they're sent. With a ``clock`` every request takes one second.
+    """
+
+    transport = Elasticsearch("http://localhost:9200").transport
+
+    def __init__(self, rejected, clock=None):
+        self.rejected = set(rejected)
+        self.clock = clock
+        self.bodies = []
+
+    def options(self, **_):
+        return self
+
+    def bulk(self, body, **_):
+        self.bodies.append(bytes(body))
+        if self.clock is not None:
+            self.clock.now += 1.0
+        items = []
+        for line in body.splitlines()[1::2]:
+            x = json.loads(line)["x"]
+            status = 429 if x in self.rejected else 201
+            self.rejected.discard(x)
+            items.append({"index": {"status": status, "x": x}})
+        return ObjectApiResponse(meta=None, raw={"items": items})
+
+
+class TestStreamingBulk:
+    @staticmethod
+    def process_bulk_chunk(client, bulk_actions, bulk_data, *args, **kwargs):
+        # Earlier chunks take longer to complete than later ones.
+        time.sleep(0.01 * (10 - bulk_data[0][1]["x"] // 10))
+        return [(True, {"index": {"x": data[1]["x"]}}) for data in bulk_data]
+
+    def test_pipelined_results_are_in_order(self):
+        with mock.patch(
+            "elasticsearch.helpers.actions._process_bulk_chunk",
+            side_effect=self.process_bulk_chunk,
+        ):
+            results = list(
+                helpers.streaming_bulk(
+                    Elasticsearch("http://localhost:9200"),
+                    ({"x": i} for i in range(100)),
+                    chunk_size=10,
+                    pipeline_depth=4,
+                )
+            )
+
+        assert [(True, {"index": {"x": i}}) for i in range(100)] == results
+
+    def test_pipelined_chunks_are_in_flight_concurrently(self):
+        in_flight, max_in_flight = [0], [0]
+
+        def process_bulk_chunk(*args, **kwargs):
+            with lock_side_effect:
+                in_flight[0] += 1
+                max_in_flight[0] = max(max_in_flight[0], in_flight[0])
+            time.sleep(0.05)
+            with lock_side_effect:
+                in_flight[0] -= 1
+            return self.process_bulk_chunk(*args, **kwargs)
+
+        with mock.patch(
+            "elasticsearch.helpers.actions._process_bulk_chunk",
+            side_effect=process_bulk_chunk,
+        ):
+            results = list(
+                helpers.streaming_bulk(
+                    Elasticsearch("http://localhost:9200"),
+                    ({"x": i} for i in range(100)),
+                    chunk_size=10,
+                    pipeline_depth=3,
+                )
+            )
+
+        assert 100 == len(results)
+        assert 1 < max_in_flight[0] <= 3
+
+    @pytest.fixture
+    def clock(self):
+        clock = FakeClock()
+        # the backoff isn't shortened randomly
+        with mock.patch.object(actions, "time", clock), mock.patch(
+            "random.uniform", side_effect=lambda a, b: b
+        ):
+            yield clock
+
+    @staticmethod
+    def sent(client):
+        return [
+            [json.loads(line)["x"] for line in body.splitlines()[1::2]]
+            for body in client.bodies
+        ]
+
+    def test_rejected_documents_are_retried_once_due(self, clock):
+        # every odd document is rejected on its first attempt
+        client = RejectingBulkClient(rejected=range(1, 40, 2), clock=clock)
+        results = list(
+            helpers.streaming_bulk(
+                client,
+                ({"x": i} for i in range(40)),
+                chunk_size=10,
+                raise_on_error=False,
+                max_retries=1,
+                initial_backoff=0,
+            )
+        )
+
+        assert [True] * 40 == [ok for ok, _ in results]
+        assert 40 == len({info["index"]["x"] for _, info in results})
+        # without a backoff the rejected documents are due right away
+        # and are sent before the next chunk
+        assert [
+            list(range(0, 10)),
+            list(range(1, 10, 2)),
+            list(range(10, 20)),
+            list(range(11, 20, 2)),
+            list(range(20, 30)),
+            list(range(21, 30, 2)),
+            list(range(30, 40)),
+            list(range(31, 40, 2)),
+        ] == self.sent(client)
+        assert [] == clock.sleeps
+
+    def test_due_retries_are_sent_before_the_input_ends(self, clock):
+        client = RejectingBulkClient(rejected={0}, clock=clock)
+        results = list(
+            helpers.streaming_bulk(
+                client,
+                ({"x": i} for i in range(100)),
+                chunk_size=10,
+                raise_on_error=False,
+                max_retries=1,
+                initial_backoff=5,
+            )
+        )
+
+        assert [True] * 100 == [ok for ok, _ in results]
+        # the first chunk completes after a second, the retry is due
+        # five seconds later and is sent between the new chunks.
+        assert [[0]] == self.sent(client)[6:7]
+        assert 11 == len(client.bodies)
+        assert [] == clock.sleeps
+
+    def test_new_chunks_and_due_retries_interleave(self, clock):
+        client = RejectingBulkClient(rejected={0, 20, 21, 30}, clock=clock)
+        results = list(
+            helpers.streaming_bulk(
+                client,
+                ({"x": i} for i in range(60)),
+                chunk_size=10,
+                raise_on_error=False,
+                max_retries=1,
+                initial_backoff=2,
+            )
+        )
+
+        assert [True] * 60 == [ok for ok, _ in results]
+        # documents rejected until a retry is due are sent together
+        assert [
+            list(range(0, 10)),
+            list(range(10, 20)),
+            list(range(20, 30)),
+            [0, 20, 21],
+            list(range(30, 40)),
+            list(range(40, 50)),
+            list(range(50, 60)),
+            [30],
+        ] == self.sent(client)
+        assert [] == clock.sleeps
+
+    def test_new_chunks_are_sent_while_rejected_documents_wait(self, clock):
+        client = RejectingBulkClient(rejected=range(1, 40, 2), clock=clock)
+        results = list(
+            helpers.streaming_bulk(
+                client,
+                ({"x": i} for i in range(40)),
+                chunk_size=10,
+                raise_on_error=False,
+                max_retries=1,
+                initial_backoff=10,
+            )
+        )
+
+        assert [True] * 40 == [ok for ok, _ in results]
+        # all new chunks are sent before the first retry is due, a full
+        # retry chunk is due as early as its first document.
+        assert [
+            list(range(0, 10)),
+            list(range(10, 20)),
+            list(range(20, 30)),
+            list(range(30, 40)),
+            list(range(1, 20, 2)),
+            list(range(21, 40, 2)),
+        ] == self.sent(client)
+        # then it waits for the retries which are due after 11 and 13 seconds
+        assert [7.0, 1.0] == clock.sleeps
+
+    def test_spooled_chunks_are_removed_once_every_action_has_a_result(self, tmp_path):
+        client = RejectingBulkClient(rejected={1})
+        spooled = []
+        for _, info in helpers.streaming_bulk(
+            client,
+            ({"x": i} for i in range(4)),
+            chunk_size=2,
+            raise_on_error=False,
+            max_retries=1,
+            initial_backoff=0,
+            spool_dir=str(tmp_path),
+        ):
+            segments = sorted(path.name for path in tmp_path.iterdir())
+            spooled.append((info["index"]["x"], segments))
+
+        # the first segment is kept until the rejected document was retried
+        assert [
+            (0, ["00000000000000000001.ndjson"]),
+            (1, []),
+            (2, ["00000000000000000002.ndjson"]),
+            (3, []),
+        ] == spooled
+
+    def test_spooled_chunks_are_replayed(self, tmp_path):
+        # Segment left behind by a process which died while writing
+        (tmp_path / "00000000000000000001.ndjson").write_bytes(
+            b'{"index":{}}\n{"x":1}\n{"index":{}}\n{"x"'
+        )
+
+        client = RejectingBulkClient(rejected=())
+        with mock.patch.object(
+            client, "bulk", side_effect=ConnectionError("connection refused")
+        ):
+            with pytest.raises(ConnectionError):
+                list(
+                    helpers.streaming_bulk(client, [{"x": 2}], spool_dir=str(tmp_path))
+                )
+        # Segments are kept when the request failed
+        assert 1 == len(list(tmp_path.iterdir()))
+
+        results = list(
+            helpers.streaming_bulk(client, [{"x": 3}], spool_dir=str(tmp_path))
+        )
+        assert [1, 3] == [info["index"]["x"] for _, info in results]
+        assert [
+            b'{"index":{}}\n{"x":1}\n',
+            b'{"index":{}}\n{"x":3}\n',
+        ] == client.bodies
+        assert [] == list(tmp_path.iterdir())
+
+
+class TestAdaptiveChunkSize:
+    def test_chunk_size_grows_while_requests_are_fast(self):
+        chunk_sizer = actions._AdaptiveChunkSize(max_chunk_size=600)
+        chunk_sizer.record(500, 0.1, False)
+        assert 550 == chunk_sizer.chunk_size
+        chunk_sizer.record(550, 0.1, False)
+        chunk_sizer.record(600, 0.1, False)
+        assert 600 == chunk_sizer.chunk_size
+
+    def test_chunk_size_is_halved_on_slow_requests_and_rejections(self):
+        chunk_sizer = actions._AdaptiveChunkSize(min_chunk_size=200)
+        chunk_sizer.record(500, 5.0, False)
+        assert 250 == chunk_sizer.chunk_size
+        # chunks which were sent at the same time only shrink it once
+        chunk_sizer.record(500, 0.1, True)
+        assert 250 == chunk_sizer.chunk_size
+        chunk_sizer.record(250, 0.1, True)
+        assert 200 == chunk_sizer.chunk_size
+
+    def test_small_chunks_are_ignored(self):
+        chunk_sizer = actions._AdaptiveChunkSize()
+        # a chunk of a single retried document and a small last chunk
+        chunk_sizer.record(1, 0.1, True)
+        chunk_sizer.record(100, 5.0, False)
+        assert 500 == chunk_sizer.chunk_size
+        chunk_sizer.record(300, 5.0, False)
+        assert 250 == chunk_sizer.chunk_size
+
+    def test_rejected_execution_is_detected(self):
+        assert actions._is_rejected({"index": {"status": 429}})
+        assert actions._is_rejected(
+            {
+                "index": {
+                    "status": 503,
+                    "error": {"type": "es_rejected_execution_exception"},
+                }
+            }
+        )
+        assert not actions._is_rejected(
+            {"index": {"status": 400, "error": {"type": "mapper_parsing_exception"}}}
+        )
+
+    def test_streaming_bulk_follows_chunk_size(self):
+        chunk_sizes = []
+
+        def process_bulk_chunk(client, bulk_actions, bulk_data, *args, **kwargs):
+            chunk_sizes.append(len(bulk_data))
+            status = 429 if len(chunk_sizes) == 2 else 201
+            return [(status == 201, {"index": {"status": status}}) for _ in bulk_data]
+
+        with mock.patch(
+            "elasticsearch.helpers.actions._process_bulk_chunk",
+            side_effect=process_bulk_chunk,
+        ):
+            results = list(
+                helpers.streaming_bulk(
+                    Elasticsearch("http://localhost:9200"),
+                    ({"x": i} for i in range(2000)),
+                    chunk_size="auto",
+                    raise_on_error=False,
+                )
+            )
+
+        assert 2000 == len(results)
+        assert [500, 550, 275, 325, 350] == chunk_sizes[:5]
+
+
+class TestProcessBulk:
+    def test_chunks_are_serialized_in_worker_processes(self):
+        bodies = []
+
+        def process_bulk_chunk(client, bulk_actions, bulk_data, *args, **kwargs):
+            bodies.append(bulk_actions)
+            return [(True, {"index": data[1]}) for data in bulk_data]
+
+        with mock.patch(
+            "elasticsearch.helpers.actions._process_bulk_chunk",
+            side_effect=process_bulk_chunk,
+        ):
+            results = list(
+                helpers.process_bulk(
+                    Elasticsearch("http://localhost:9200"),
+                    ({"_id": i, "x": i} for i in range(100)),
+                    process_count=2,
+                    chunk_size=10,
+                )
+            )
+
+        assert [(True, {"index": {"x": i}}) for i in range(100)] == results
+        assert 10 == len(bodies)
+        assert bodies[0].startswith(b'{"index":{"_id":0}}\n{"x":0}\n')
+
+
+class TestBulkProcessor:
+    def setup_method(self, _):
+        self.bodies = []
+
+    def process_bulk_chunk(self, client, bulk_actions, bulk_data, *args, **kwargs):
+        self.bodies.append(bulk_actions)
+        return [
+            (True, {"index": data[-1]})
+            if data[-1].get("ok", True)
+            else (False, {"index": {"status": 400, "error": "failed"}})
+            for data in bulk_data
+        ]
+
+    def test_full_chunks_are_sent_and_close_flushes_the_rest(self):
+        results = []
+        with mock.patch(
+            "elasticsearch.helpers.actions._process_bulk_chunk",
+            side_effect=self.process_bulk_chunk,
+        ):
+            with helpers.BulkProcessor(
+                Elasticsearch("http://localhost:9200"),
+                chunk_size=2,
+                flush_interval=None,
+                success_callback=results.append,
+            ) as processor:
+                for i in range(5):
+                    processor.add({"_id": i, "x": i})
+                processor.flush()
+                assert 3 == len(self.bodies)
+
+                processor.add({"_id": 5, "x": 5})
+
+        assert [
+            b'{"index":{"_id":0}}\n{"x":0}\n{"index":{"_id":1}}\n{"x":1}\n',
+            b'{"index":{"_id":2}}\n{"x":2}\n{"index":{"_id":3}}\n{"x":3}\n',
+            b'{"index":{"_id":4}}\n{"x":4}\n',
+            b'{"index":{"_id":5}}\n{"x":5}\n',
+        ] == self.bodies
+        assert [{"index": {"x": i}} for i in range(6)] == results
+
+        with pytest.raises(RuntimeError):
+            processor.add({"x": 6})
+
+    def test_buffered_actions_are_sent_after_flush_interval(self):
+        with mock.patch(
+            "elasticsearch.helpers.actions._process_bulk_chunk",
+            side_effect=self.process_bulk_chunk,
+        ):
+            processor = helpers.BulkProcessor(
+                Elasticsearch("http://localhost:9200"), flush_interval=0.05
+            )
+            processor.add({"x": 1})
+            for _ in range(100):
+                if self.bodies:
+                    break
+                time.sleep(0.01)
+            assert [b'{"index":{}}\n{"x":1}\n'] == self.bodies
+            processor.close()
+
+        assert 1 == len(self.bodies)
+
+    def test_actions_are_added_from_many_threads(self):
+        with mock.patch(
+            "elasticsearch.helpers.actions._process_bulk_chunk",
+            side_effect=self.process_bulk_chunk,
+        ):
+            processor = helpers.BulkProcessor(
+                Elasticsearch("http://localhost:9200"),
+                chunk_size=10,
+                concurrent_requests=3,
+            )
+            threads = [
+                threading.Thread(
+                    target=lambda: [processor.add({"x": i}) for i in range(100)]
+                )
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            processor.close()
+
+        assert 40 == len(self.bodies)
+        assert 400 == sum(body.count(b"\n") for body in self.bodies) // 2
+
+    def test_errors_are_reported(self):
+        errors = []
+        with mock.patch(
+            "elasticsearch.helpers.actions._process_bulk_chunk",
+            side_effect=self.process_bulk_chunk,
+        ):
+            with helpers.BulkProcessor(
+                Elasticsearch("http://localhost:9200"), error_callback=errors.append
+            ) as processor:
+                processor.add({"x": 1})
+                processor.add({"x": 2, "ok": False})
+        assert [{"index": {"status": 400, "error": "failed"}}] == errors
+
+        with mock.patch(
+            "elasticsearch.helpers.actions._process_bulk_chunk",
+            side_effect=ConnectionError("connection refused"),
+        ):
+            with helpers.BulkProcessor(
+                Elasticsearch("http://localhost:9200"), error_callback=errors.append
+            ) as processor:
+                processor.add({"_id": "1", "x": 1})
+                processor.add({"_op_type": "delete", "_id": "2"})
+        error = errors[1]["index"].pop("exception")
+        assert isinstance(error, ConnectionError)
+        assert errors[1:] == [
+            {
+                "index": {
+                    "error": "connection refused",
+                    "status": None,
+                    "data": {"x": 1},
+                    "_id": "1",
+                }
+            },
+            {
+                "delete": {
+                    "error": "connection refused",
+                    "status": None,
+                    "exception": error,
+                    "_id": "2",
+                }
+            },
+        ]
+
+    def test_spooled_actions_are_removed_once_sent(self, tmp_path):
+        with mock.patch(
+            "elasticsearch.helpers.actions._process_bulk_chunk",
+            side_effect=self.process_bulk_chunk,
+        ):
+            with helpers.BulkProcessor(
+                Elasticsearch("http://localhost:9200"),
+                chunk_size=2,
+                flush_interval=None,
+                spool_dir=str(tmp_path),
+            ) as processor:
+                processor.add({"_id": 1, "x": 1})
+                assert [b'{"index":{"_id":1}}\n{"x":1}\n'] == [
+                    path.read_bytes() for path in tmp_path.iterdir()
+                ]
+                for i in range(2, 6):
+                    processor.add({"_id": i, "x": i})
+
+        assert 3 == len(self.bodies)
+        assert [] == list(tmp_path.iterdir())
+
+    def test_spooled_actions_are_replayed(self, tmp_path):
+        # Segments left behind by a process which died while writing
+        (tmp_path / "00000000000000000001.ndjson").write_bytes(
+            b'{"index":{"_id":1}}\n{"x":1}\n{"delete":{"_id":2}}\n'
+        )
+        (tmp_path / "00000000000000000002.ndjson").write_bytes(
+            b'{"index":{"_id":3}}\n{"x":3}\n{"index":{"_id":4}}\n{"x"'
+        )
+
+        results = []
+        with mock.patch(
+            "elasticsearch.helpers.actions._process_bulk_chunk",
+            side_effect=ConnectionError("connection refused"),
+        ):
+            with helpers.BulkProcessor(
+                Elasticsearch("http://localhost:9200"),
+                spool_dir=str(tmp_path),
+                error_callback=results.append,
+            ) as processor:
+                processor.add({"_id": 5, "x": 5})
+        # Segments are kept when the request failed
+        assert [1, 2, 3, 5] == [
+            next(iter(result.values()))["_id"] for result in results
+        ]
+        assert 3 == len(list(tmp_path.iterdir()))
+
+        with mock.patch(
+            "elasticsearch.helpers.actions._process_bulk_chunk",
+            side_effect=self.process_bulk_chunk,
+        ):
+            with helpers.BulkProcessor(
+                Elasticsearch("http://localhost:9200"),
+                spool_dir=str(tmp_path),
+                success_callback=results.append,
+            ):
+                pass
+
+        assert [
+            b'{"index":{"_id":1}}\n{"x":1}\n{"delete":{"_id":2}}\n',
+            b'{"index":{"_id":3}}\n{"x":3}\n',
+            b'{"index":{"_id":5}}\n{"x":5}\n',
+        ] == self.bodies
+        assert [] == list(tmp_path.iterdir())
+
+
+@pytest.mark.skipif(pd is None, reason="Test requires pandas to be available")
+class TestBulkFromDataFrame:
+    def bulk_from_dataframe(self, df, **kwargs):
+        self.bodies = []
+
+        def process_bulk_chunk(client, bulk_actions, bulk_data, *args, **kwargs):
+            self.bodies.append(bulk_actions)
+            return [(True, data[0]) for data in bulk_data]
+
+        with mock.patch(
+            "elasticsearch.helpers.actions._process_bulk_chunk",
+            side_effect=process_bulk_chunk,
+        ):
+            return helpers.bulk_from_dataframe(
+                Elasticsearch("http://localhost:9200"), df, **kwargs
+            )
+
+    def test_rows_are_indexed_with_metadata_columns(self):
+        df = pd.DataFrame(
+            {"id": ["a", "b", "c"], "x": [1, 2, 3], "route": ["r", None, "r"]}
+        )
+        assert (3, []) == self.bulk_from_dataframe(
+            df,
+            index="i",
+            id_column="id",
+            routing_column="route",
+            batch_size=2,
+            chunk_size=2,
+        )
+        assert self.bodies == [
+            b'{"index":{"_index":"i","_id":"a","routing":"r"}}\n{"x":1}\n'
+            b'{"index":{"_index":"i","_id":"b"}}\n{"x":2}\n',
+            b'{"index":{"_index":"i","_id":"c","routing":"r"}}\n{"x":3}\n',
+        ]
+
+    def test_update_and_delete(self):
+        df = pd.DataFrame({"id": ["a", "b"], "x": [1, 2]})
+        self.bulk_from_dataframe(df, index="i", id_column="id", op_type="update")
+        assert self.bodies == [
+            b'{"update":{"_index":"i","_id":"a"}}\n{"doc":{"x":1}}\n'
+            b'{"update":{"_index":"i","_id":"b"}}\n{"doc":{"x":2}}\n',
+        ]
+
+        self.bulk_from_dataframe(df, index="i", id_column="id", op_type="delete")
+        assert self.bodies == [
+            b'{"delete":{"_index":"i","_id":"a"}}\n'
+            b'{"delete":{"_index":"i","_id":"b"}}\n',
+        ]
+
+    def test_unknown_op_type(self):
+        with pytest.raises(ValueError):
+            self.bulk_from_dataframe(pd.DataFrame({"x": [1]}), op_type="upsert")
+
+
+class TestScan:
+    @staticmethod
+    def response(scroll_id, hits):
+        return ObjectApiResponse(
+            meta=None,
+            raw={
+                "_scroll_id": scroll_id,
+                "_shards": {"successful": 5, "total": 5},
+                "hits": {"hits": hits},
+            },
+        )
+
+    def test_pages_are_prefetched(self):
+        pages = [[{"_id": str(i)}] for i in range(1, 4)] + [[]]
+        scroll_calls = []
+
+        def scroll(**kwargs):
+            scroll_calls.append(kwargs)
+            return self.response("scroll", pages[len(scroll_calls) - 1])
+
+        with mock.patch.object(
+            Elasticsearch,
+            "search",
+            return_value=self.response("scroll", [{"_id": "0"}]),
+        ), mock.patch.object(
+            Elasticsearch, "scroll", side_effect=scroll
+        ), mock.patch.object(
+            Elasticsearch, "clear_scroll"
+        ) as clear_scroll:
+            hits = []
+            for hit in helpers.scan(Elasticsearch("http://localhost:9200"), prefetch=2):
+                hits.append(hit["_id"])
+                if len(hits) == 1:
+                    # wait for the background thread to fill the buffer
+                    time.sleep(0.05)
+                    assert 3 == len(scroll_calls)
+
+        assert ["0", "1", "2", "3"] == hits
+        clear_scroll.assert_called_once_with(scroll_id="scroll")
+
+    def test_scroll_is_cleared_when_closed_early(self):
+        with mock.patch.object(
+            Elasticsearch,
+            "search",
+            return_value=self.response("scroll", [{"_id": "0"}]),
+        ), mock.patch.object(
+            Elasticsearch,
+            "scroll",
+            return_value=self.response("scroll", [{"_id": "1"}]),
+        ), mock.patch.object(
+            Elasticsearch, "clear_scroll"
+        ) as clear_scroll:
+            hits = helpers.scan(Elasticsearch("http://localhost:9200"), prefetch=2)
+            assert {"_id": "0"} == next(hits)
+            hits.close()
+
+        clear_scroll.assert_called_once_with(scroll_id="scroll")
+
+
+class TestReindex:
+    @pytest.mark.parametrize("thread_count", [1, 2])
+    def test_pipelined_reindex(self, thread_count):
+        pages = [
+            [{"_id": str(p * 10 + i), "_source": {}} for i in range(10)]
+            for p in range(5)
+        ]
+        bulk_bodies, progress = [], []
+
+        def process_bulk_chunk(client, bulk_actions, bulk_data, *args, **kwargs):
+            bulk_bodies.append(bulk_actions)
+            return [(True, {"index": data[0]["index"]}) for data in bulk_data]
+
+        with mock.patch.object(
+            Elasticsearch, "search", return_value=TestScan.response("s", pages[0])
+        ), mock.patch.object(
+            Elasticsearch,
+            "scroll",
+            side_effect=[TestScan.response("s", page) for page in pages[1:] + [[]]],
+        ), mock.patch.object(
+            Elasticsearch, "clear_scroll"
+        ), mock.patch(
+            "elasticsearch._sync.client.indices.IndicesClient.get_data_stream",
+            return_value={"data_streams": []},
+        ), mock.patch(
+            "elasticsearch.helpers.actions._process_bulk_chunk",
+            side_effect=process_bulk_chunk,
+        ):
+            result = helpers.reindex(
+                Elasticsearch("http://localhost:9200"),
+                "source",
+                "target",
+                chunk_size=20,
+                pipelined=True,
+                thread_count=thread_count,
+                progress_callback=progress.append,
+            )
+
+        assert (50, 0) == result
+        assert 3 == len(bulk_bodies)
+        assert b'{"index":{"_id":"0","_index":"target"}}\n{}\n' in bulk_bodies[0]
+        assert [20, 40, 50] == [p["indexed"] for p in progress]
+        assert {"scanned": 50, "indexed": 50, "failed": 0} == progress[-1]
+
+
+class TestParallelScan:
+    @staticmethod
+    def search(slice, failed_shards=0, **kwargs):
+        return ObjectApiResponse(
+            meta=None,
+            raw={
+                "_scroll_id": "scroll-%d" % slice["id"],
+                "_shards": {"successful": 5 - failed_shards, "total": 5},
+                "hits": {
+                    "hits": [{"_id": "%d-%d" % (slice["id"], i)} for i in range(3)]
+                },
+            },
+        )
+
+    @staticmethod
+    def scroll(scroll_id, **kwargs):
+        return ObjectApiResponse(
+            meta=None,
+            raw={
+                "_scroll_id": scroll_id,
+                "_shards": {"total": 5},
+                "hits": {"hits": []},
+            },
+        )
+
+    def test_all_slices_are_scanned(self):
+        with mock.patch.object(
+            Elasticsearch, "search", side_effect=self.search
+        ) as search, mock.patch.object(
+            Elasticsearch, "scroll", side_effect=self.scroll
+        ), mock.patch.object(
+            Elasticsearch, "clear_scroll"
+        ) as clear_scroll:
+            hits = list(
+                helpers.parallel_scan(
+                    Elasticsearch("http://localhost:9200"),
+                    {"query": {"match_all": {}}},
+                    slices=4,
+                    workers=2,
+                    index="test-index",
+                )
+            )
+
+        assert sorted("%d-%d" % (s, i) for s in range(4) for i in range(3)) == sorted(
+            hit["_id"] for hit in hits
+        )
+        assert [{"id": s, "max": 4} for s in range(4)] == sorted(
+            (c[1]["slice"] for c in search.call_args_list), key=lambda s: s["id"]
+        )
+        assert {"scroll-%d" % s for s in range(4)} == {
+            c[1]["scroll_id"] for c in clear_scroll.call_args_list
+        }
+
+    def test_all_scrolls_are_cleared_on_error(self):
+        def search(slice, **kwargs):
+            return self.search(slice, failed_shards=int(slice["id"] == 1), **kwargs)
+
+        with mock.patch.object(
+            Elasticsearch, "search", side_effect=search
+        ), mock.patch.object(
+            Elasticsearch, "scroll", side_effect=self.scroll
+        ), mock.patch.object(
+            Elasticsearch, "clear_scroll"
+        ) as clear_scroll:
+            with pytest.raises(helpers.ScanError):
+                list(
+                    helpers.parallel_scan(
+                        Elasticsearch("http://localhost:9200"), slices=3, size=1
+                    )
+                )
+
+        assert {"scroll-%d" % s for s in range(3)} == {
+            c[1]["scroll_id"] for c in clear_scroll.call_args_list
+        }
+
+
+class TestPitScan:
+    @staticmethod
+    def search(body, failed_shards=0, **kwargs):
+        start = body.get("search_after", [-1])[0] + 1
+        return ObjectApiResponse(
+            meta=None,
+            raw={
+                "pit_id": "pit-%d" % start,
+                "_shards": {"successful": 5 - failed_shards, "total": 5},
+                "hits": {
+                    "hits": [
+                        {"_id": str(i), "sort": [i]}
+                        for i in range(start, min(start + 2, 5))
+                    ]
+                },
+            },
+        )
+
+    def test_pages_are_fetched_with_search_after(self):
+        with mock.patch.object(
+            Elasticsearch,
+            "open_point_in_time",
+            return_value=ObjectApiResponse(meta=None, raw={"id": "pit"}),
+        ) as open_point_in_time, mock.patch.object(
+            Elasticsearch, "search", side_effect=self.search
+        ) as search, mock.patch.object(
+            Elasticsearch, "close_point_in_time"
+        ) as close_point_in_time:
+            hits = list(
+                helpers.pit_scan(
+                    Elasticsearch("http://localhost:9200"),
+                    "test-index",
+                    {"query": {"match_all": {}}},
+                    size=2,
+                )
+            )
+
+        assert [str(i) for i in range(5)] == [hit["_id"] for hit in hits]
+        open_point_in_time.assert_called_once_with(index="test-index", keep_alive="5m")
+        assert 3 == search.call_count
+        body = search.call_args[1]["body"]
+        assert ["_shard_doc"] == body["sort"]
+        assert [3] == body["search_after"]
+        assert {"id": "pit-2", "keep_alive": "5m"} == body["pit"]
+        close_point_in_time.assert_called_once_with(body={"id": "pit-4"})
+
+    def test_point_in_time_is_closed_on_error(self):
+        with mock.patch.object(
+            Elasticsearch,
+            "open_point_in_time",
+            return_value=ObjectApiResponse(meta=None, raw={"id": "pit"}),
+        ), mock.patch.object(
+            Elasticsearch,
+            "search",
+            side_effect=lambda body, **kwargs: self.search(body, failed_shards=1),
+        ), mock.patch.object(
+            Elasticsearch, "close_point_in_time"
+        ) as close_point_in_time:
+            with pytest.raises(helpers.ScanError):
+                list(
+                    helpers.pit_scan(
+                        Elasticsearch("http://localhost:9200"), "i", size=2
+                    )
+                )
+
+        close_point_in_time.assert_called_once_with(body={"id": "pit-0"})
+
 
 class TestChunkActions:
     def setup_method(self, _):
@@ -166,6 +1119,16 @@ class TestChunkActions:
             list(helpers._chunk_actions(self.actions, 100000, 1, JSONSerializer()))
         )
 
+    def test_chunks_are_newline_delimited_bytes(self):
+        ((chunk_data, chunk_actions),) = helpers._chunk_actions(
+            self.actions[:2], 10, 99999999, JSONSerializer()
+        )
+        assert [self.actions[0], self.actions[1]] == chunk_data
+        assert (
+            b'{"index":{}}\n{"some":"dat\xc3\xa1","i":0}\n'
+            b'{"index":{}}\n{"some":"dat\xc3\xa1","i":1}\n'
+        ) == chunk_actions
+
     def test_chunks_are_chopped_by_chunk_size(self):
         assert 10 == len(
             list(helpers._chunk_actions(self.actions, 10, 99999999, JSONSerializer()))
@@ -180,8 +1143,7 @@ class TestChunkActions:
         )
         assert 25 == len(chunks)
         for chunk_data, chunk_actions in chunks:
-            chunk = b"".join(chunk_actions)
-            assert len(chunk) <= max_byte_size
+            assert len(chunk_actions) <= max_byte_size
 
     def test_add_helper_meta_to_kwargs(self):
         assert actions._add_helper_meta_to_kwargs({}, "b") == {
@@ -16,28 +16,51 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
+import json
 import sys
 import uuid
 from datetime import datetime
 from decimal import Decimal
 
+import mock
 import pytest
 
 try:
     import numpy as np
+except ImportError:
+    np = None
+
+try:
     import pandas as pd
 except ImportError:
-    np = pd = None
+    pd = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 import re
 
 from elasticsearch import Elasticsearch
 from elasticsearch.exceptions import SerializationError
-from elasticsearch.serializer import JSONSerializer, TextSerializer
+from elasticsearch.serializer import (
+    JSONSerializer,
+    LazyHits,
+    LazyHitsJsonSerializer,
+    NdjsonSerializer,
+    TextSerializer,
+)
 
 requires_numpy_and_pandas = pytest.mark.skipif(
     np is None or pd is None, reason="Test requires numpy or pandas to be available"
 )
+requires_numpy = pytest.mark.skipif(
+    np is None, reason="Test requires numpy to be available"
+)
+requires_orjson = pytest.mark.skipif(
+    orjson is None, reason="Test requires orjson to be available"
+)
 
 
 def test_datetime_serialization():
@@ -174,11 +197,216 @@ def test_strings_are_left_untouched():
     assert b"\xe4\xbd\xa0\xe5\xa5\xbd" == TextSerializer().dumps("你好")
 
 
+def test_ndjson_encoded_body_is_not_copied():
+    body = b'{"index":{}}\n{"key":"value"}\n'
+    assert body is NdjsonSerializer().dumps(body)
+    assert body == NdjsonSerializer().dumps(body[:-1])
+    assert body == NdjsonSerializer().dumps([{"index": {}}, {"key": "value"}])
+
+
 def test_text_raises_serialization_error_on_dump_error():
     with pytest.raises(SerializationError):
         TextSerializer().dumps({})
 
 
+@requires_orjson
+class TestOrjsonSerializer:
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {"d": datetime(2010, 10, 1, 2, 30, 0, 123)},
+            {"d": Decimal("0.1")},
+            {"d": uuid.UUID("00000000-0000-0000-0000-000000000003")},
+            {1: "int key", "big": 2 ** 70, "s": "caf\u00e9 \ud800"},
+        ],
+    )
+    def test_serializes_like_json_serializer(self, data):
+        from elasticsearch.serializer import OrjsonSerializer
+
+        assert OrjsonSerializer().dumps(data) == JSONSerializer().dumps(data)
+
+    @requires_numpy
+    @pytest.mark.parametrize(
+        ["value", "dtype"],
+        [
+            ("2021-01-02", "datetime64[D]"),
+            (["2021-01-02", "2021-01-03"], "datetime64[D]"),
+            ("2021-01-02T03:04:05", "datetime64[s]"),
+            (["2021-01-02T03:04:05"], "datetime64[ms]"),
+            (0.1, "float32"),
+            ([0.1, 0.5, -2.0], "float32"),
+            ([[0.1], [1.5]], "float64"),
+            ([1, 2], "int32"),
+            ([True, False], "bool"),
+        ],
+    )
+    def test_serializes_numpy_like_json_serializer(self, value, dtype):
+        from elasticsearch.serializer import OrjsonSerializer
+
+        array = np.array(value, dtype=dtype)
+        for data in ({"v": array}, {"v": array[()] if array.ndim == 0 else array[0]}):
+            assert OrjsonSerializer().dumps(data) == JSONSerializer().dumps(data)
+
+    @requires_numpy_and_pandas
+    def test_serializes_numpy_and_pandas(self):
+        from elasticsearch.serializer import OrjsonSerializer
+
+        # Arrays which aren't contiguous are serialized as well
+        matrix = np.arange(6).reshape(2, 3)[:, ::2]
+        assert OrjsonSerializer().dumps({"m": matrix}) == b'{"m":[[0,2],[3,5]]}'
+        assert OrjsonSerializer().dumps(
+            {"d": pd.Series(["a", "b"])}
+        ) == JSONSerializer().dumps({"d": ["a", "b"]})
+
+    def test_serializes_lazy_hits(self):
+        from elasticsearch.serializer import OrjsonSerializer
+
+        resp = LazyHitsJsonSerializer().loads(b'{"hits": {"hits": [{"_id": "1"}]}}')
+        assert OrjsonSerializer().dumps(resp) == b'{"hits":{"hits":[{"_id":"1"}]}}'
+
+    def test_raises_serialization_error_on_dump_error(self):
+        from elasticsearch.serializer import OrjsonSerializer
+
+        with pytest.raises(SerializationError):
+            OrjsonSerializer().dumps(object())
+
+    @pytest.mark.parametrize(
+        ["data", "serialized"],
+        [
+            ({"a": float("nan"), "b": None}, b'{"a":null,"b":null}'),
+            ([float("inf"), float("-inf")], b"[null,null]"),
+            ({"d": Decimal("Infinity")}, b'{"d":null}'),
+            ({"nullable": "null"}, b'{"nullable":"null"}'),
+        ],
+    )
+    def test_serializes_data_with_null_with_one_encode(self, data, serialized):
+        from elasticsearch.serializer import OrjsonSerializer
+
+        with mock.patch("json.dumps") as json_dumps, mock.patch(
+            "orjson.dumps", wraps=orjson.dumps
+        ) as orjson_dumps:
+            assert OrjsonSerializer().dumps(data) == serialized
+        assert 1 == orjson_dumps.call_count
+        assert not json_dumps.called
+
+    @pytest.mark.parametrize("data", [b'{"a": 1}', b'{"a": NaN}', '{"a": 1}'])
+    def test_deserializes_like_json_serializer(self, data):
+        from elasticsearch.serializer import OrjsonSerializer
+
+        assert repr(OrjsonSerializer().loads(data)) == repr(
+            JSONSerializer().loads(data)
+        )
+
+    def test_ndjson(self):
+        from elasticsearch.serializer import OrjsonNdjsonSerializer
+
+        serializer = OrjsonNdjsonSerializer()
+        assert serializer.mimetype == "application/x-ndjson"
+        assert (
+            serializer.dumps([{"d": datetime(2010, 10, 1)}, b'{"a":1}'])
+            == b'{"d":"2010-10-01T00:00:00"}\n{"a":1}\n'
+        )
+        assert serializer.loads(b'{"a":1}\n{"b":2}\n') == [{"a": 1}, {"b": 2}]
+
+    def test_used_by_default(self):
+        from elasticsearch.serializer import OrjsonNdjsonSerializer, OrjsonSerializer
+
+        serializers = Elasticsearch("http://localhost:9200").transport.serializers
+        assert isinstance(
+            serializers.get_serializer("application/json"), OrjsonSerializer
+        )
+        assert isinstance(
+            serializers.get_serializer("application/x-ndjson"),
+            OrjsonNdjsonSerializer,
+        )
+
+
+class TestLazyHitsJsonSerializer:
+    hits = [
+        {"_id": "1", "_source": {"title": 'caf\u00e9 "]', "tags": ["a", {}]}},
+        {"_id": "2", "_source": {}},
+    ]
+    response = {
+        "_scroll_id": "scroll-id",
+        "hits": {"total": {"value": 2}, "hits": hits},
+        "aggregations": {"top": {"hits": {"hits": [{"_id": "3"}]}}},
+    }
+
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_hits_are_decoded_lazily(self, indent):
+        data = json.dumps(self.response, indent=indent).encode("utf-8")
+        resp = LazyHitsJsonSerializer().loads(data)
+
+        hits = resp["hits"]["hits"]
+        assert isinstance(hits, LazyHits)
+        assert len(hits) == 2
+        assert hits == self.hits
+        assert list(hits) == self.hits
+        assert hits[-1] == {"_id": "2", "_source": {}}
+        assert hits[:1] == self.hits[:1]
+        # Everything else is decoded as usual
+        assert resp["_scroll_id"] == "scroll-id"
+        assert resp["hits"]["total"] == {"value": 2}
+        assert resp["aggregations"] == self.response["aggregations"]
+
+    def test_msearch_hits_are_decoded_lazily(self):
+        data = json.dumps(
+            {"responses": [self.response, {"error": {"type": "error"}}]}
+        ).encode("utf-8")
+        resp = LazyHitsJsonSerializer().loads(data)
+
+        assert isinstance(resp["responses"][0]["hits"]["hits"], LazyHits)
+        assert resp["responses"][0]["hits"]["hits"] == self.hits
+        assert resp["responses"][1] == {"error": {"type": "error"}}
+
+    @pytest.mark.parametrize(
+        "data", [b"[1, 2]", b'{"hits": 1}', b'{"hits": {"hits": null}}', b"{}"]
+    )
+    def test_other_responses_are_decoded_as_usual(self, data):
+        assert LazyHitsJsonSerializer().loads(data) == json.loads(data)
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b'{"hits": {"hits": [{}, ]}}',
+            b'{"hits": {"hits": [{}}',
+            b'{"hits" {}}',
+            b'{"hits": {}} {}',
+            b"{hits: {}}",
+        ],
+    )
+    def test_raises_serialization_error_on_load_error(self, data):
+        with pytest.raises(SerializationError):
+            LazyHitsJsonSerializer().loads(data)
+
+    def test_hits_are_serialized_as_list(self):
+        data = json.dumps(self.response).encode("utf-8")
+        resp = LazyHitsJsonSerializer().loads(data)
+
+        assert json.loads(JSONSerializer().dumps(resp)) == self.response
+        assert json.loads(NdjsonSerializer().dumps([resp])) == self.response
+        assert json.loads(json.dumps(resp, default=list)) == self.response
+
+    @pytest.mark.parametrize(
+        "mimetype",
+        ["application/json", "application/vnd.elasticsearch+json;compatible-with=8"],
+    )
+    def test_only_used_when_configured(self, mimetype):
+        data = json.dumps(self.response).encode("utf-8")
+
+        serializers = Elasticsearch("http://localhost:9200").transport.serializers
+        hits = serializers.loads(data, mimetype)["hits"]["hits"]
+        assert type(hits) is list
+        assert hits == self.hits
+
+        serializers = Elasticsearch(
+            "http://localhost:9200",
+            serializers={"application/json": LazyHitsJsonSerializer()},
+        ).transport.serializers
+        hits = serializers.loads(data, "application/json")["hits"]["hits"]
+        assert isinstance(hits, LazyHits)
+
+
 class TestDeserializer:
     def setup_method(self, _):
         self.serializers = Elasticsearch("http://localhost:9200").transport.serializers
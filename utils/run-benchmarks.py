@@ -0,0 +1,297 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+"""Micro-benchmarks of the client's per-call overhead. No cluster is
+needed, requests aren't sent. Run a single benchmark with:
+
+    $ python utils/run-benchmarks.py options
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import timeit
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, base_dir)
+
+
+def report(name, stmt, number, **namespace):
+    # Best of a few repeats is the least noisy estimate of the cost
+    seconds = min(timeit.repeat(stmt, globals=namespace, number=number, repeat=5))
+    print(f"{name:<50} {seconds / number * 1e6:10.2f} us/call")
+
+
+class NullTransport:
+    """Transport which responds without sending requests"""
+
+    def __init__(self):
+        from elastic_transport import ApiResponseMeta, HttpHeaders
+
+        self.meta = ApiResponseMeta(
+            status=200,
+            http_version="1.1",
+            headers=HttpHeaders({"x-elastic-product": "Elasticsearch"}),
+            duration=0.0,
+            node=None,
+        )
+
+    def perform_request(self, method, target, **kwargs):
+        return self.meta, {}
+
+
+def bench_perform_request(number):
+    from elasticsearch import Elasticsearch
+
+    client = Elasticsearch(_transport=NullTransport(), headers={"custom": "key"})
+    report(
+        "client._perform_request(...)",
+        "client._perform_request('GET', '/')",
+        number,
+        client=client,
+    )
+    report(
+        "client._perform_request(..., headers=ndjson)",
+        "client._perform_request('POST', '/_bulk', headers=headers, body=b'')",
+        number,
+        client=client,
+        headers={"content-type": "application/x-ndjson"},
+    )
+
+
+def bench_query_params(number):
+    from elasticsearch._sync.client.utils import query_params
+
+    @query_params("if_primary_term", "if_seq_no", "refresh", "routing", "version")
+    def index(index, document, id=None, params=None, headers=None):
+        return params
+
+    namespace = {"index": index}
+    report("index(...)", "index(index='i', document={}, id='1')", number, **namespace)
+    report(
+        "index(..., refresh=True, routing=...)",
+        "index(index='i', document={}, id='1', refresh=True, routing='r')",
+        number,
+        **namespace,
+    )
+    report(
+        "index(..., headers=...)",
+        "index(index='i', document={}, id='1', headers={'X-Custom': 'value'})",
+        number,
+        **namespace,
+    )
+
+
+def bench_make_path(number):
+    from elasticsearch._sync.client.utils import _make_path
+
+    namespace = {"_make_path": _make_path}
+    report(
+        "_make_path(index, '_doc', id)",
+        "_make_path('my-index', '_doc', 'document-id')",
+        number,
+        **namespace,
+    )
+    report(
+        "_make_path(index, '_update', <unique id>)",
+        "_make_path('my-index', '_update', str(next(ids)))",
+        number,
+        ids=iter(range(10 ** 8)),
+        **namespace,
+    )
+
+
+def bench_serializer(number):
+    import datetime
+
+    from elasticsearch import serializer
+
+    document = {
+        "@timestamp": datetime.datetime(2021, 11, 10, 12, 30),
+        "message": "GET /search HTTP/1.1 200 1070000",
+        "tags": ["web", "prod"],
+        "http": {"status": 200, "bytes": 1070000, "duration": 0.125},
+    }
+    response = {
+        "took": 5,
+        "hits": {
+            "total": {"value": 100, "relation": "eq"},
+            "hits": [
+                {"_index": "logs", "_id": str(i), "_source": document}
+                for i in range(100)
+            ],
+        },
+    }
+    try:
+        import numpy as np
+
+        embedding = {"embedding": np.random.rand(768).astype(np.float32)}
+    except ImportError:
+        embedding = None
+
+    classes = [serializer.JsonSerializer]
+    if hasattr(serializer, "OrjsonSerializer"):
+        classes.append(serializer.OrjsonSerializer)
+    for serializer_class in classes:
+        instance = serializer_class()
+        name = serializer_class.__name__
+        data = instance.dumps(response)
+        report(
+            f"{name}.dumps(document)",
+            "dumps(document)",
+            number,
+            dumps=instance.dumps,
+            document=document,
+        )
+        report(
+            f"{name}.loads(100 hits)",
+            "loads(data)",
+            number // 10,
+            loads=instance.loads,
+            data=data,
+        )
+        if embedding is not None:
+            report(
+                f"{name}.dumps(768 dim numpy vector)",
+                "dumps(embedding)",
+                number // 10,
+                dumps=instance.dumps,
+                embedding=embedding,
+            )
+
+
+def report_import(name, code, repeat=10):
+    # Import time is measured in a fresh interpreter each time, '-X importtime'
+    # reports it without the interpreter's own startup. Cumulative time
+    # of all top-level imports, in microseconds.
+    timings = []
+    for _ in range(repeat):
+        stderr = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=base_dir,
+            stderr=subprocess.PIPE,
+            check=True,
+            universal_newlines=True,
+        ).stderr
+        timings.append(
+            sum(
+                int(cumulative)
+                for cumulative, module in re.findall(
+                    r"^import time:\s+\d+ \|\s+(\d+) \| (\S.*)$", stderr, re.M
+                )
+                if module.startswith("elasticsearch")
+            )
+        )
+    print(f"{name:<50} {min(timings) / 1000:10.2f} ms")
+
+
+def bench_import(number):
+    report_import("import elasticsearch", "import elasticsearch")
+    report_import(
+        "from elasticsearch import AsyncElasticsearch",
+        "from elasticsearch import AsyncElasticsearch",
+    )
+    report_import(
+        "Elasticsearch(...).indices",
+        "import elasticsearch; "
+        "elasticsearch.Elasticsearch('http://localhost:9200').indices",
+    )
+
+
+def bench_options(number):
+    from elasticsearch import Elasticsearch
+
+    client = Elasticsearch("http://localhost:9200")
+    report(
+        "Elasticsearch(_transport=...)",
+        "type(client)(_transport=client.transport)",
+        number,
+        client=client,
+    )
+    report("client.options()", "client.options()", number, client=client)
+    report(
+        "client.options(opaque_id=...)",
+        "client.options(opaque_id='id')",
+        number,
+        client=client,
+    )
+    report(
+        "client.options(opaque_id=...).indices",
+        "client.options(opaque_id='id').indices",
+        number,
+        client=client,
+    )
+
+
+def bench_construct(number):
+    from elasticsearch import AsyncElasticsearch, Elasticsearch
+
+    for client_class in (Elasticsearch, AsyncElasticsearch):
+        client = client_class("http://localhost:9200")
+        name = client_class.__name__
+        report(
+            f"{name}(_transport=...)",
+            "client_class(_transport=client.transport)",
+            number,
+            client_class=client_class,
+            client=client,
+        )
+        report(
+            f"{name}(_transport=...).indices",
+            "client_class(_transport=client.transport).indices",
+            number,
+            client_class=client_class,
+            client=client,
+        )
+
+
+BENCHMARKS = {
+    "construct": bench_construct,
+    "import": bench_import,
+    "make_path": bench_make_path,
+    "options": bench_options,
+    "perform_request": bench_perform_request,
+    "query_params": bench_query_params,
+    "serializer": bench_serializer,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "benchmarks",
+        nargs="*",
+        help="benchmarks to run (%s), runs all of them by default"
+        % ", ".join(sorted(BENCHMARKS)),
+    )
+    parser.add_argument(
+        "--number", type=int, default=10000, help="number of calls per repeat"
+    )
+    args = parser.parse_args()
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error("unknown benchmarks: %s" % ", ".join(sorted(unknown)))
+
+    for name in args.benchmarks or sorted(BENCHMARKS):
+        print(f"[{name}]")
+        BENCHMARKS[name](args.number)
+
+
+if __name__ == "__main__":
+    main()